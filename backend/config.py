@@ -5,102 +5,110 @@ Adapted for Gemini API (Google AI) as primary provider
 """
 
 import os
+from dataclasses import dataclass
 from typing import Optional
 from dotenv import load_dotenv
-from pydantic import Field
-from pydantic_settings import BaseSettings
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-class Settings(BaseSettings):
+def _env_str(name: str, default: str) -> str:
+    """Read a string setting from the environment"""
+    return os.getenv(name, default)
+
+
+def _env_optional(name: str) -> Optional[str]:
+    """Read an optional setting; unset or empty values become None"""
+    return os.getenv(name) or None
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    return int(os.getenv(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    return float(os.getenv(name, default))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting (true/1/yes/on, case-insensitive)"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("true", "1", "yes", "on")
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """
-    Application settings loaded from environment variables
-    All values are validated using Pydantic v2
+    Application settings read once from environment variables
+    
+    Values are resolved when this module is imported (after .env is loaded)
+    and are immutable afterwards.
     """
     
     # ===== Gemini API Settings (Primary) =====
-    GEMINI_API_KEY: Optional[str] = Field(
-        default=None,
-        description="Gemini API key (required; get from https://aistudio.google.com/app/apikey)"
-    )
+    # Gemini API key (required; get from https://aistudio.google.com/app/apikey)
+    GEMINI_API_KEY: Optional[str] = _env_optional("GEMINI_API_KEY")
     
     # ===== Groq Settings (Fast Inference) =====
-    GROQ_API_KEY: Optional[str] = Field(
-        default=None,
-        description="Groq API key (get from https://console.groq.com/keys)"
-    )
-    GROQ_MODEL: str = Field(
-        default="llama-3.3-70b-versatile",
-        description="Groq model name (e.g., llama-3.3-70b-versatile, mixtral-8x7b-32768)"
-    )
+    # Groq API key (get from https://console.groq.com/keys)
+    GROQ_API_KEY: Optional[str] = _env_optional("GROQ_API_KEY")
+    # Groq model name (e.g., llama-3.3-70b-versatile, mixtral-8x7b-32768)
+    GROQ_MODEL: str = _env_str("GROQ_MODEL", "llama-3.3-70b-versatile")
     
     # ===== OpenAI Settings (Fallback) =====
-    OPENAI_API_KEY: Optional[str] = Field(
-        default=None,
-        description="OpenAI API key (fallback if Gemini/Groq not configured)"
-    )
+    # OpenAI API key (fallback if Gemini/Groq not configured)
+    OPENAI_API_KEY: Optional[str] = _env_optional("OPENAI_API_KEY")
     
     # ===== Application Settings =====
-    APP_NAME: str = "Healthcare Knowledge Assistant"
-    APP_VERSION: str = "1.0.0"
-    DEBUG_MODE: bool = Field(
-        default=False,
-        description="Enable debug logging and auto-reload"
-    )
+    APP_NAME: str = _env_str("APP_NAME", "Healthcare Knowledge Assistant")
+    APP_VERSION: str = _env_str("APP_VERSION", "1.0.0")
+    # Enable debug logging and auto-reload
+    DEBUG_MODE: bool = _env_bool("DEBUG_MODE", False)
+    # Uvicorn worker processes (auto-reload only applies with a single worker)
+    API_WORKERS: int = _env_int("API_WORKERS", 1)
     
     # ===== Vector Database Settings =====
-    CHROMA_PERSIST_DIRECTORY: str = Field(
-        default="./vectordb/chroma_db",
-        description="ChromaDB persistent storage directory"
-    )
-    CHROMA_COLLECTION_NAME: str = Field(
-        default="healthcare_docs",
-        description="ChromaDB collection name"
-    )
+    # ChromaDB persistent storage directory
+    CHROMA_PERSIST_DIRECTORY: str = _env_str("CHROMA_PERSIST_DIRECTORY", "./vectordb/chroma_db")
+    # ChromaDB collection name
+    CHROMA_COLLECTION_NAME: str = _env_str("CHROMA_COLLECTION_NAME", "healthcare_docs")
     
     # ===== Document Processing Settings =====
-    DOCUMENTS_PATH: str = Field(
-        default="./data/sample_docs",
-        description="Path to healthcare documents"
-    )
-    CHUNK_SIZE: int = Field(
-        default=1000,
-        description="Text chunk size for splitting documents (tokens)"
-    )
-    CHUNK_OVERLAP: int = Field(
-        default=200,
-        description="Overlap between chunks (tokens)"
-    )
+    # Path to healthcare documents
+    DOCUMENTS_PATH: str = _env_str("DOCUMENTS_PATH", "./data/sample_docs")
+    # Text chunk size for splitting documents (tokens)
+    CHUNK_SIZE: int = _env_int("CHUNK_SIZE", 1000)
+    # Overlap between chunks (tokens)
+    CHUNK_OVERLAP: int = _env_int("CHUNK_OVERLAP", 200)
+    # Number of chunks embedded per embedding API call during ingestion
+    EMBEDDING_BATCH_SIZE: int = _env_int("EMBEDDING_BATCH_SIZE", 100)
+    # Maximum embedding API calls in flight at once during ingestion
+    EMBEDDING_CONCURRENCY: int = _env_int("EMBEDDING_CONCURRENCY", 8)
     
     # ===== RAG Settings =====
-    RETRIEVAL_TOP_K: int = Field(
-        default=5,
-        description="Number of document chunks to retrieve per query"
-    )
-    LLM_TEMPERATURE: float = Field(
-        default=0.0,
-        description="LLM temperature (0.0 = deterministic, 1.0 = creative)"
-    )
-    LLM_MAX_OUTPUT_TOKENS: int = Field(
-        default=1000,
-        description="Maximum tokens for LLM response"
-    )
+    # Number of document chunks to retrieve per query
+    RETRIEVAL_TOP_K: int = _env_int("RETRIEVAL_TOP_K", 5)
+    # LLM temperature (0.0 = deterministic, 1.0 = creative)
+    LLM_TEMPERATURE: float = _env_float("LLM_TEMPERATURE", 0.0)
+    # Maximum tokens for LLM response
+    LLM_MAX_OUTPUT_TOKENS: int = _env_int("LLM_MAX_OUTPUT_TOKENS", 1000)
+    # Seconds a cached retrieval result stays valid
+    RETRIEVAL_CACHE_TTL_SECONDS: int = _env_int("RETRIEVAL_CACHE_TTL_SECONDS", 300)
+    # Maximum LLM calls in flight at once (respects provider rate limits)
+    LLM_MAX_CONCURRENCY: int = _env_int("LLM_MAX_CONCURRENCY", 8)
     
     # ===== Model Settings =====
-    EMBEDDING_MODEL: str = Field(
-        default="models/gemini-embedding-001",
-        description="Embedding model name (Gemini: models/gemini-embedding-001)"
-    )
-    CHAT_MODEL: str = Field(
-        default="models/gemini-2.5-flash",  # Or models/gemini-2.5-flash for faster/cheaper
-        description="Chat model name (Gemini Pro 2.5)"
-    )
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # Embedding model name (Gemini: models/gemini-embedding-001)
+    EMBEDDING_MODEL: str = _env_str("EMBEDDING_MODEL", "models/gemini-embedding-001")
+    # Leading embedding dimensions kept per vector (Matryoshka truncation; 0 = full size)
+    EMBEDDING_DIMENSIONS: int = _env_int("EMBEDDING_DIMENSIONS", 256)
+    # Chat model name (Gemini Pro 2.5); or models/gemini-2.5-flash for faster/cheaper
+    CHAT_MODEL: str = _env_str("CHAT_MODEL", "models/gemini-2.5-flash")
     
     def is_gemini_configured(self) -> bool:
         """
@@ -202,4 +210,5 @@ if not settings.is_gemini_configured() and not settings.is_groq_configured() and
     raise ValueError(
         "❌ Application is not properly configured.\n"
         "Please set GEMINI_API_KEY, GROQ_API_KEY, or OPENAI_API_KEY in your .env file."
-    )
\ No newline at end of file
+    )
+
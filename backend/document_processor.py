@@ -5,20 +5,97 @@ Handles loading, chunking, and embedding of hospital documents
 
 import os
 import time
-from typing import List, Tuple
+import asyncio
+import hashlib
+import json
+import functools
+import sqlite3
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-from langchain_community.document_loaders import TextLoader, DirectoryLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import numpy as np
+import semchunk
+import tiktoken
 from langchain_openai import OpenAIEmbeddings, AzureOpenAIEmbeddings
 from langchain_google_genai import GoogleGenerativeAIEmbeddings  # NEW: Gemini support
 from langchain_community.vectorstores import Chroma
 from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
 
 from backend.config import settings
 
 
 
+@functools.lru_cache(maxsize=None)
+def _get_chunker(chunk_size: int):
+    """
+    Build the token-based chunker once per chunk size and reuse it across ingests
+    
+    Args:
+        chunk_size: Maximum chunk size in cl100k_base tokens
+    
+    Returns:
+        semchunk chunker callable
+    """
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    return semchunk.chunkerify(tokenizer, chunk_size=chunk_size)
+
+
+async def _aembed_query_batch(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    Embed several search queries in one API call
+    
+    Args:
+        embeddings: Embeddings client
+        texts: Query texts
+    
+    Returns:
+        List of query vectors, in the same order as texts
+    """
+    if isinstance(embeddings, GoogleGenerativeAIEmbeddings):
+        # Same task type Gemini uses for single queries
+        return await embeddings.aembed_documents(texts, task_type="RETRIEVAL_QUERY")
+    return await embeddings.aembed_documents(texts)
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Wraps an embeddings client and keeps only the leading dimensions
+    
+    Gemini and OpenAI v3 embeddings are Matryoshka-trained, so a prefix of
+    the vector is itself a usable embedding. Truncated vectors are
+    re-normalized to unit length so cosine/L2 distances stay well-scaled.
+    Documents and queries go through the same reduction.
+    """
+    
+    def __init__(self, inner: Embeddings, dimensions: int):
+        self.inner = inner
+        self.dimensions = dimensions
+    
+    def _reduce(self, vectors: List[List[float]]) -> List[List[float]]:
+        matrix = np.asarray(vectors, dtype=np.float32)[:, :self.dimensions]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        return matrix.tolist()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(self.inner.embed_documents(texts))
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self._reduce([self.inner.embed_query(text)])[0]
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(await self.inner.aembed_documents(texts))
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        return self._reduce([await self.inner.aembed_query(text)])[0]
+    
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(await _aembed_query_batch(self.inner, texts))
+
+
 class DocumentProcessor:
     """
     Handles document loading, chunking, and ingestion into ChromaDB
@@ -30,6 +107,41 @@ class DocumentProcessor:
     - Stores in ChromaDB with metadata
     """
     
+    # Bump when chunk metadata or collection settings change; a manifest
+    # with another version forces a rebuild
+    INDEX_VERSION = 3
+    
+    # HNSW settings applied when the collection is created. Chroma keeps
+    # vectors as float32 with no scalar-quantization option, so index memory
+    # is controlled through EMBEDDING_DIMENSIONS instead
+    COLLECTION_METADATA = {
+        "hnsw:space": "cosine",
+        "hnsw:construction_ef": 200,
+        "hnsw:M": 32,
+        "hnsw:search_ef": 64
+    }
+    
+    # Filename keywords -> audience tag stored on every chunk (first match wins)
+    AUDIENCE_KEYWORDS = (
+        ("billing", ("billing", "insurance", "pricing", "payment", "cost")),
+        ("clinical", ("clinical", "medication", "treatment", "protocol", "nursing")),
+    )
+    
+    # Read each document through a 1 MiB buffer to keep syscalls down
+    READ_BUFFER_SIZE = 1 << 20
+    
+    # Files read in parallel during ingestion (loading is I/O bound)
+    LOAD_WORKERS = 16
+    
+    # Max hashes per SELECT ... IN (...) (stays under SQLite's variable limit)
+    CACHE_LOOKUP_BATCH = 500
+    
+    # Chunks written to Chroma per add() call
+    CHROMA_WRITE_BATCH = 256
+    
+    # Layout version of the embedding cache file (stored as PRAGMA user_version)
+    EMBEDDING_CACHE_VERSION = 1
+    
     def __init__(self):
         """Initialize document processor with configuration"""
         self.documents_path = settings.DOCUMENTS_PATH
@@ -38,13 +150,41 @@ class DocumentProcessor:
         self.persist_directory = settings.CHROMA_PERSIST_DIRECTORY
         self.collection_name = settings.CHROMA_COLLECTION_NAME
         
-        # Initialize embeddings
-        self.embeddings = self._initialize_embeddings()
+        # Sidecar cache of chunk embeddings keyed by content hash
+        self.embedding_cache_path = os.path.join(
+            self.persist_directory, "embedding_cache.sqlite3"
+        )
+        
+        # File fingerprints of the last successful ingestion
+        self.manifest_path = os.path.join(self.persist_directory, "ingest_manifest.json")
+        
+        # Chunk count, read from disk once and kept current by ingest_documents()
+        self._count = self._load_count_from_db()
+        
+        # Shared Chroma instance, created lazily by get_vectorstore()
+        self._vectorstore = None
+        
+        # Embeddings client, created on first use by the embeddings property
+        self._embeddings = None
         
         # Ensure persist directory exists
         Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
         print(f"✓ Vector database directory: {self.persist_directory}")
     
+    @property
+    def embeddings(self):
+        """
+        Embeddings client, initialized on first access
+        
+        Keeps client setup off the import path for requests that never embed.
+        """
+        if self._embeddings is None:
+            embeddings = self._initialize_embeddings()
+            if settings.EMBEDDING_DIMENSIONS:
+                embeddings = TruncatedEmbeddings(embeddings, settings.EMBEDDING_DIMENSIONS)
+            self._embeddings = embeddings
+        return self._embeddings
+    
     def _initialize_embeddings(self):
         """
         Initialize embedding model based on configuration
@@ -77,19 +217,96 @@ class DocumentProcessor:
             return GoogleGenerativeAIEmbeddings(
                 model=embedding_config["model"],  # e.g., "models/gemini-embedding-001"
                 google_api_key=embedding_config["api_key"],
-                dimensions=768,  # Balanced dim (reduce storage/speed up search; full=3072)
+                dimensions=settings.EMBEDDING_DIMENSIONS or 3072,  # Matryoshka prefix size (full=3072)
                 # task_type auto-set by LangChain: RETRIEVAL_DOCUMENT for docs, RETRIEVAL_QUERY for queries
             )
         
         else:
             raise ValueError(f"❌ Unsupported embedding provider: {provider}")
     
-    def load_documents(self) -> List[Document]:
+    def _find_document_paths(self, directory: str) -> List[str]:
+        """
+        Recursively collect .txt files under a directory
+        
+        Args:
+            directory: Directory to scan
+        
+        Returns:
+            Sorted list of file paths
+        """
+        paths = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    paths.extend(self._find_document_paths(entry.path))
+                elif entry.is_file() and entry.name.endswith(".txt"):
+                    paths.append(entry.path)
+        return sorted(paths)
+    
+    def _infer_audience(self, filename: str) -> str:
+        """
+        Tag a document with its audience from filename keywords
+        
+        Args:
+            filename: Document filename
+        
+        Returns:
+            "billing", "clinical" or "general"
+        """
+        name = filename.lower()
+        for audience, keywords in self.AUDIENCE_KEYWORDS:
+            if any(keyword in name for keyword in keywords):
+                return audience
+        return "general"
+    
+    def _read_document(self, path: str) -> Document:
         """
-        Load all text documents from the documents directory
+        Read a single text file into a Document
+        
+        Args:
+            path: Path to the .txt file
         
         Returns:
-            List of Document objects
+            Document with the file contents and its source path
+        """
+        try:
+            with open(path, "r", encoding="utf-8", buffering=self.READ_BUFFER_SIZE) as f:
+                text = f.read()
+        except Exception as e:
+            raise ValueError(f"❌ Error loading document {path}: {str(e)}")
+        
+        basename = os.path.basename(path)
+        return Document(
+            page_content=text,
+            metadata={
+                "source": path,
+                "basename": basename,
+                "audience": self._infer_audience(basename)
+            }
+        )
+    
+    def _read_documents(self, paths: List[str]) -> Iterator[Document]:
+        """
+        Read files on a thread pool, yielding Documents in path order
+        
+        Args:
+            paths: Paths of the .txt files to read
+        
+        Returns:
+            Iterator of Document objects
+        """
+        with ThreadPoolExecutor(max_workers=self.LOAD_WORKERS) as executor:
+            yield from executor.map(self._read_document, paths)
+    
+    def load_documents(self) -> Iterator[Document]:
+        """
+        Lazily load all text documents from the documents directory
+        
+        The directory is checked up front; files are then read in
+        parallel on a thread pool as the returned iterator is consumed.
+        
+        Returns:
+            Iterator of Document objects
             
         Raises:
             FileNotFoundError: If documents directory doesn't exist
@@ -102,35 +319,25 @@ class DocumentProcessor:
                 f"❌ Documents directory not found: {self.documents_path}"
             )
         
-        # Load all .txt files from directory
-        loader = DirectoryLoader(
-            self.documents_path,
-            glob="**/*.txt",
-            loader_cls=TextLoader,
-            loader_kwargs={"encoding": "utf-8"}
-        )
+        paths = self._find_document_paths(self.documents_path)
+        print(f"✓ Found {len(paths)} documents")
         
-        try:
-            documents = loader.load()
-        except Exception as e:
-            raise ValueError(f"❌ Error loading documents: {str(e)}")
-        
-        print(f"✓ Loaded {len(documents)} documents")
-        
-        if len(documents) == 0:
+        if len(paths) == 0:
             raise ValueError(
                 f"❌ No .txt files found in {self.documents_path}. "
                 "Please add documents to this directory."
             )
         
-        return documents
+        return self._read_documents(paths)
     
-    def split_documents(self, documents: List[Document]) -> List[Document]:
+    def split_documents(self, documents: Iterable[Document]) -> List[Document]:
         """
         Split documents into overlapping chunks for embedding
         
+        Documents are split one at a time as they arrive from the loader.
+        
         Args:
-            documents: List of Document objects
+            documents: Iterable of Document objects
         
         Returns:
             List of chunked Document objects with metadata
@@ -139,16 +346,16 @@ class DocumentProcessor:
         print(f"   Chunk size: {self.chunk_size} tokens")
         print(f"   Overlap: {self.chunk_overlap} tokens")
         
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""],
-            is_separator_regex=False
-        )
+        # Token-based chunking so CHUNK_SIZE/CHUNK_OVERLAP really are tokens
+        chunker = _get_chunker(self.chunk_size)
         
-        chunks = text_splitter.split_documents(documents)
-        print(f"✓ Created {len(chunks)} chunks from {len(documents)} documents")
+        chunks = []
+        document_count = 0
+        for document in documents:
+            for text in chunker(document.page_content, overlap=self.chunk_overlap):
+                chunks.append(Document(page_content=text, metadata=dict(document.metadata)))
+            document_count += 1
+        print(f"✓ Created {len(chunks)} chunks from {document_count} documents")
         
         # Add chunk index to metadata
         for i, chunk in enumerate(chunks):
@@ -157,6 +364,223 @@ class DocumentProcessor:
         
         return chunks
     
+    async def _embed_all(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in batches, keeping up to EMBEDDING_CONCURRENCY batches in flight
+        
+        Args:
+            texts: Chunk texts to embed
+        
+        Returns:
+            List of embedding vectors, in the same order as texts
+        """
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        semaphore = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+        
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+        
+        return [vector for batch_vectors in results for vector in batch_vectors]
+    
+    def _embedding_key(self, text: str) -> bytes:
+        """
+        Cache key for a chunk: sha256 of the embedding model, dimensions and chunk text
+        
+        Args:
+            text: Chunk text
+        
+        Returns:
+            32-byte digest
+        """
+        return hashlib.sha256(f"{settings.EMBEDDING_MODEL}\0{settings.EMBEDDING_DIMENSIONS}\0{text}".encode("utf-8")).digest()
+    
+    @staticmethod
+    def _quantize(vector: List[float]) -> Tuple[float, bytes]:
+        """
+        Quantize a vector to int8 with a symmetric per-vector scale
+        
+        Args:
+            vector: Embedding vector
+        
+        Returns:
+            Tuple of (scale, int8 bytes)
+        """
+        array = np.asarray(vector, dtype=np.float32)
+        scale = float(np.abs(array).max()) / 127 or 1.0
+        return scale, np.round(array / scale).astype(np.int8).tobytes()
+    
+    @staticmethod
+    def _dequantize(scale: float, blob: bytes) -> np.ndarray:
+        """
+        Restore an int8-quantized vector
+        
+        Args:
+            scale: Per-vector scale from _quantize
+            blob: int8 bytes from _quantize
+        
+        Returns:
+            float32 embedding vector (not re-normalized; see _embed_texts)
+        """
+        return np.frombuffer(blob, dtype=np.int8).astype(np.float32) * np.float32(scale)
+    
+    def _migrate_embedding_cache(self, conn: sqlite3.Connection) -> None:
+        """
+        Bring the embedding cache file up to EMBEDDING_CACHE_VERSION
+        
+        Runs the schema changes once per file; later opens only read the
+        version number.
+        
+        Args:
+            conn: Open connection to the embedding cache
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= self.EMBEDDING_CACHE_VERSION:
+            return
+        
+        with conn:
+            # Vectors are stored as int8 + scale (4x smaller than float32);
+            # the float32 table of earlier versions is dropped
+            conn.execute("DROP TABLE IF EXISTS embeddings")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings_q8 "
+                "(hash BLOB PRIMARY KEY, scale REAL NOT NULL, vec BLOB NOT NULL)"
+            )
+            conn.execute(f"PRAGMA user_version = {self.EMBEDDING_CACHE_VERSION}")
+    
+    def _load_cached_embeddings(
+        self, conn: sqlite3.Connection, keys: List[bytes]
+    ) -> Dict[bytes, np.ndarray]:
+        """
+        Fetch cached embeddings for the given keys
+        
+        Args:
+            conn: Open connection to the embedding cache
+            keys: Chunk cache keys
+        
+        Returns:
+            Dictionary of key -> embedding vector for every cache hit
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        cached = {}
+        
+        for i in range(0, len(unique_keys), self.CACHE_LOOKUP_BATCH):
+            batch = unique_keys[i:i + self.CACHE_LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, scale, vec FROM embeddings_q8 WHERE hash IN ({placeholders})",
+                batch
+            )
+            for key, scale, blob in rows:
+                cached[key] = self._dequantize(scale, blob)
+        
+        return cached
+    
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, reusing cached vectors for unchanged chunks
+        
+        Only cache misses are sent to the embedding API (see _embed_all);
+        their vectors are then added to the cache. Fresh vectors go through
+        the same int8 round trip as cached ones, so the stored index does
+        not depend on which chunks were cache hits. All vectors are packed
+        into one contiguous float32 matrix and L2-normalized in a single
+        operation.
+        
+        Must be called from a thread without a running event loop.
+        
+        Args:
+            texts: Chunk texts to embed
+        
+        Returns:
+            (len(texts), dimensions) float32 matrix, rows in the same order as texts
+        """
+        keys = [self._embedding_key(text) for text in texts]
+        
+        os.makedirs(self.persist_directory, exist_ok=True)
+        with closing(sqlite3.connect(self.embedding_cache_path)) as conn:
+            self._migrate_embedding_cache(conn)
+            cached = self._load_cached_embeddings(conn, keys)
+            missing = [i for i, key in enumerate(keys) if key not in cached]
+            
+            print(f"\n🧮 Embedding {len(missing)} of {len(texts)} chunks "
+                  f"({len(texts) - len(missing)} cached, "
+                  f"batch size: {settings.EMBEDDING_BATCH_SIZE}, "
+                  f"concurrency: {settings.EMBEDDING_CONCURRENCY})...")
+            
+            if missing:
+                new_vectors = asyncio.run(self._embed_all([texts[i] for i in missing]))
+                rows = [
+                    (keys[i], *self._quantize(vector))
+                    for i, vector in zip(missing, new_vectors)
+                ]
+                
+                with conn:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO embeddings_q8 (hash, scale, vec) VALUES (?, ?, ?)",
+                        rows
+                    )
+                
+                # Use the dequantized form, exactly as a later cache hit would
+                for key, scale, blob in rows:
+                    cached[key] = self._dequantize(scale, blob)
+        
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        
+        vectors = np.stack([np.asarray(cached[key], dtype=np.float32) for key in keys])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+        
+        print(f"✓ Created {len(vectors)} embeddings")
+        return vectors
+    
+    def _fingerprint_documents(self) -> Dict[str, List[int]]:
+        """
+        Fingerprint the documents directory without reading file contents
+        
+        Returns:
+            Dictionary of path -> [mtime_ns, size] for every .txt file
+        """
+        fingerprint = {}
+        for path in self._find_document_paths(self.documents_path):
+            stat = os.stat(path)
+            fingerprint[path] = [stat.st_mtime_ns, stat.st_size]
+        return fingerprint
+    
+    def _read_manifest(self) -> Optional[dict]:
+        """
+        Read the manifest written by the last successful ingestion
+        
+        Returns:
+            Manifest dictionary, or None if missing or unreadable
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_manifest(self, files: Dict[str, List[int]], chunk_count: int) -> None:
+        """
+        Atomically write the ingestion manifest
+        
+        Args:
+            files: File fingerprints taken before loading
+            chunk_count: Number of chunks stored
+        """
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "files": files,
+                "chunk_count": chunk_count,
+                "dimensions": settings.EMBEDDING_DIMENSIONS,
+                "index_version": self.INDEX_VERSION
+            }, f)
+        os.replace(tmp_path, self.manifest_path)
+    
     def ingest_documents(self, force_reindex: bool = False) -> Tuple[int, int, float]:
         """
         Main ingestion pipeline: load, chunk, and store documents
@@ -176,77 +600,155 @@ class DocumentProcessor:
         print(f"Document Ingestion Pipeline Started")
         print(f"{'='*60}")
         
-        if not force_reindex:
-            try:
-                existing_db = Chroma(
-                    collection_name=self.collection_name,
-                    embedding_function=self.embeddings,
-                    persist_directory=self.persist_directory
-                )
-                existing_count = existing_db._collection.count()
-                
-                if existing_count > 0:
-                    print(f"⚠️  Collection already exists with {existing_count} chunks")
-                    print(f"    To re-index, set force_reindex=True")
-                    return (0, existing_count, 0.0)
-            except Exception:
-                pass
+        manifest = None if force_reindex else self._read_manifest()
+        
+        if manifest is not None:
+            if manifest.get("dimensions") != settings.EMBEDDING_DIMENSIONS:
+                # Stored vectors have a different size; the collection is rebuilt below
+                print(f"🔄 Embedding dimensions changed "
+                      f"({manifest.get('dimensions')} → {settings.EMBEDDING_DIMENSIONS}), re-indexing...")
+            elif manifest.get("index_version") != self.INDEX_VERSION:
+                # Chunk metadata or collection settings changed
+                print(f"🔄 Index format changed, re-indexing...")
+            elif (os.path.exists(self.documents_path)
+                    and manifest.get("files") == self._fingerprint_documents()):
+                # Unchanged files: skip without opening Chroma
+                existing_count = manifest.get("chunk_count", 0)
+                self._count = existing_count
+                print(f"⚠️  Documents unchanged since last ingestion ({existing_count} chunks)")
+                print(f"    To re-index, set force_reindex=True")
+                return (0, existing_count, 0.0)
+            else:
+                print(f"🔄 Documents changed since last ingestion, re-indexing...")
+        elif not force_reindex:
+            # Collections built before the manifest existed may hold vectors of
+            # another size, so they are always rebuilt
+            print(f"🔄 No ingestion manifest found, re-indexing...")
         
         documents = self.load_documents()
+        files = self._fingerprint_documents()
         chunks = self.split_documents(documents)
+        documents_processed = len({chunk.metadata["source"] for chunk in chunks})
         
         print(f"\n🗄️  Creating vector store...")
         print(f"    Collection: {self.collection_name}")
         print(f"    Directory: {self.persist_directory}")
         
         try:
-            vectorstore = Chroma.from_documents(
-                documents=chunks,
-                embedding=self.embeddings,
-                collection_name=self.collection_name,
-                persist_directory=self.persist_directory
-            )
+            texts = [chunk.page_content for chunk in chunks]
+            vectors = self._embed_texts(texts)
+            
+            # Drop stale chunks so re-indexing doesn't duplicate them
+            self.get_vectorstore().delete_collection()
+            self._vectorstore = None
+            vectorstore = self.get_vectorstore()
+            
+            # Add precomputed vectors directly so Chroma doesn't re-embed,
+            # in bounded batches so each write stays small
+            batch_size = self.CHROMA_WRITE_BATCH
+            for start in range(0, len(chunks), batch_size):
+                end = min(start + batch_size, len(chunks))
+                vectorstore._collection.add(
+                    ids=[f"chunk_{i}" for i in range(start, end)],
+                    embeddings=vectors[start:end].tolist(),
+                    documents=texts[start:end],
+                    metadatas=[chunk.metadata for chunk in chunks[start:end]]
+                )
+                print(f"   Stored {end}/{len(chunks)} chunks")
             print(f"✓ Vector store created successfully")
         except Exception as e:
             raise RuntimeError(f"❌ Failed to create vector store: {str(e)}")
         
+        self._write_manifest(files, len(chunks))
+        
+        self._count = len(chunks)
+        
         elapsed_time = time.time() - start_time
         
         print(f"\n{'='*60}")
         print(f"✅ Ingestion Completed Successfully!")
-        print(f"   Documents: {len(documents)}")
+        print(f"   Documents: {documents_processed}")
         print(f"   Chunks: {len(chunks)}")
         print(f"   Time: {elapsed_time:.2f} seconds")
         print(f"{'='*60}\n")
         
-        return (len(documents), len(chunks), elapsed_time)
+        return (documents_processed, len(chunks), elapsed_time)
+    
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of search queries with a single API call
+        
+        Args:
+            texts: Query texts
+        
+        Returns:
+            List of query vectors, in the same order as texts
+        """
+        embeddings = self.embeddings
+        if isinstance(embeddings, TruncatedEmbeddings):
+            return await embeddings.aembed_queries(texts)
+        return await _aembed_query_batch(embeddings, texts)
     
     def get_vectorstore(self) -> Chroma:
         """
         Get existing vector store instance for querying
         
+        The Chroma client is created on first use and shared afterwards;
+        ingestion resets it when the collection is recreated.
+        
         Returns:
             ChromaDB vector store instance
         """
-        return Chroma(
-            collection_name=self.collection_name,
-            embedding_function=self.embeddings,
-            persist_directory=self.persist_directory
-        )
+        if self._vectorstore is None:
+            self._vectorstore = Chroma(
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings,
+                persist_directory=self.persist_directory,
+                collection_metadata=self.COLLECTION_METADATA
+            )
+        return self._vectorstore
+    
+    def _load_count_from_db(self) -> int:
+        """
+        Count stored chunks straight from Chroma's SQLite file
+        
+        Avoids constructing Chroma (and the embeddings client) just to
+        call count().
+        
+        Falls back to Chroma's own count() if the file can't be read this
+        way (e.g. a different schema version or a locked database).
+        
+        Returns:
+            Number of chunks in the collection (0 if it doesn't exist)
+        """
+        db_path = Path(self.persist_directory, "chroma.sqlite3").resolve()
+        if not db_path.exists():
+            return 0
+        try:
+            with closing(sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)) as conn:
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM embeddings e "
+                    "JOIN segments s ON e.segment_id = s.id "
+                    "JOIN collections c ON s.collection = c.id "
+                    "WHERE c.name = ? AND s.scope = 'METADATA'",
+                    (self.collection_name,)
+                ).fetchone()
+        except Exception as e:
+            print(f"⚠️  Could not read chunk count from {db_path} ({str(e)}); asking Chroma instead")
+            return self.get_vectorstore()._collection.count()
+        return row[0]
     
     def get_document_count(self) -> int:
         """
         Get count of document chunks in vector store
         
+        Served from memory: the count is read from disk at startup and
+        updated by ingest_documents().
+        
         Returns:
             Number of document chunks (0 if collection doesn't exist)
         """
-        try:
-            vectorstore = self.get_vectorstore()
-            count = vectorstore._collection.count()
-            return count
-        except Exception:
-            return 0
+        return self._count
 
 
 # Create global instance
@@ -0,0 +1,99 @@
+"""
+Micro-batching of query embeddings
+Collects questions that arrive within a few milliseconds of each other
+and embeds them with a single API call
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+
+class AsyncEmbeddingBatcher:
+    """
+    Coalesces concurrent embed requests into batched API calls
+    
+    A background task pulls requests from a queue and flushes a batch when
+    it holds MAX_BATCH texts or MAX_WAIT_MS has passed since the first one.
+    Each caller awaits a future resolved with its own vector.
+    
+    The queue and worker are bound to an event loop; they are recreated
+    transparently if the batcher is used from a different loop.
+    """
+    
+    MAX_BATCH = 32
+    MAX_WAIT_MS = 8
+    
+    def __init__(self, embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]]):
+        """
+        Args:
+            embed_batch: Coroutine function embedding a list of texts
+        """
+        self.embed_batch = embed_batch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references to in-flight flushes so they aren't garbage collected
+        self._flushes = set()
+    
+    def _ensure_worker(self) -> None:
+        """Start the batching task for the running loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+            self._flushes = set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+    
+    async def embed(self, text: str) -> List[float]:
+        """
+        Embed one text as part of the next batch
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Embedding vector
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Collect requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.MAX_WAIT_MS / 1000
+            
+            while len(batch) < self.MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Embed in the background so the next batch can start collecting
+            flush = loop.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+    
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Embed one batch and resolve its callers' futures"""
+        try:
+            vectors = await self.embed_batch([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
@@ -9,11 +9,13 @@ from typing import Dict, Any
 
 import asyncio
 import json
-from backend.tools.registry import tool_registry
+import orjson
+from backend.tools.registry import get_tool_registry
 
 from fastapi import FastAPI, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from backend.config import settings
 from backend.models import (
@@ -22,13 +24,18 @@ from backend.models import (
     IngestResponse,
     QueryRequest,
     QueryResponse,
+    BatchQueryRequest,
+    BatchQueryResponse,
+    RootResponse,
+    StatsResponse,
+    ToolsResponse,
+    ToolExecutionResponse,
     ErrorResponse
 )
 from backend.document_processor import document_processor
 
-from backend.rag_engine import RAGEngine
-# from backend.rag_engine import rag_engine
-rag_engine = RAGEngine()
+from backend.rag_engine import get_rag_engine
+from backend.tools.search_tools import close_http_session
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -37,7 +44,8 @@ app = FastAPI(
     description="RAG-based Healthcare Knowledge Assistant API",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware configuration
@@ -50,11 +58,31 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def build_tools_response():
+    """Precompute the /tools payload and warm up the tools; the tool set is fixed at import time"""
+    tool_registry = get_tool_registry()
+    await tool_registry.warmup()
+    tool_names = tool_registry.get_tool_names()
+    app.state.tools_response = ToolsResponse(
+        status="success",
+        total_tools=len(tool_names),
+        tools=tool_names,
+        schemas=tool_registry.get_all_schemas()
+    )
+
+
+@app.on_event("shutdown")
+async def close_tool_sessions():
+    """Close pooled HTTP connections held by the search tools"""
+    await close_http_session()
+
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler for all unhandled exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=ErrorResponse(
             error="Internal server error",
@@ -66,15 +94,15 @@ async def global_exception_handler(request, exc):
 
 # ===== Endpoints =====
 
-@app.get("/", response_model=Dict[str, str])
+@app.get("/", response_model=RootResponse)
 async def root():
     """Root endpoint - returns API information"""
-    return {
-        "message": f"Welcome to {settings.APP_NAME}",
-        "version": settings.APP_VERSION,
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return RootResponse(
+        message=f"Welcome to {settings.APP_NAME}",
+        version=settings.APP_VERSION,
+        docs="/docs",
+        health="/health"
+    )
 
 
 @app.get("/health", response_model=HealthCheckResponse)
@@ -106,7 +134,8 @@ async def ingest_documents(request: IngestRequest):
     Ingest documents into vector database
     
     Loads documents from configured directory, chunks them,
-    creates embeddings, and stores in ChromaDB.
+    creates embeddings, and stores in ChromaDB. Runs in a worker
+    thread so other requests keep being served meanwhile.
     
     Args:
         request: Ingestion request with options
@@ -115,10 +144,15 @@ async def ingest_documents(request: IngestRequest):
         Ingestion statistics
     """
     try:
-        docs_count, chunks_count, time_taken = document_processor.ingest_documents(
+        docs_count, chunks_count, time_taken = await run_in_threadpool(
+            document_processor.ingest_documents,
             force_reindex=request.force_reindex
         )
         
+        # Point the RAG engine at the rebuilt collection
+        if docs_count > 0:
+            get_rag_engine().reload_index()
+        
         return IngestResponse(
             success=True,
             message="Documents ingested successfully" if docs_count > 0 else "No new documents to ingest",
@@ -172,7 +206,7 @@ async def query_knowledge_base(request: QueryRequest):
         if request.chat_history:
             chat_history_data = [{"role": msg.role, "content": msg.content} for msg in request.chat_history]
         
-        result = rag_engine.query(
+        result = await get_rag_engine().query(
             question=request.question,
             user_role=request.user_role,
             include_sources=request.include_sources,
@@ -190,7 +224,90 @@ async def query_knowledge_base(request: QueryRequest):
         )
 
 
-@app.get("/stats", response_model=Dict[str, Any])
+@app.post("/query_batch", response_model=BatchQueryResponse)
+async def query_knowledge_base_batch(request: BatchQueryRequest):
+    """
+    Answer several questions in one request
+    
+    Uncached questions are embedded in one API call and searched with one
+    vector-store query per role; the LLM calls overlap (up to LLM_MAX_CONCURRENCY).
+    
+    Args:
+        request: Batch of query requests
+    
+    Returns:
+        One QueryResponse per query, in request order
+    """
+    try:
+        if document_processor.get_document_count() == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No documents ingested. Please call /ingest endpoint first."
+            )
+        
+        queries = request.queries
+        results = await get_rag_engine().batch_query(
+            questions=[query.question for query in queries],
+            user_roles=[query.user_role for query in queries],
+            chat_histories=[
+                [{"role": msg.role, "content": msg.content} for msg in query.chat_history]
+                if query.chat_history else None
+                for query in queries
+            ]
+        )
+        for query, result in zip(queries, results):
+            if not query.include_sources:
+                result["sources"] = []
+        
+        return BatchQueryResponse(results=[QueryResponse(**result) for result in results])
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch query processing failed: {str(e)}"
+        )
+
+
+@app.post("/query/stream")
+async def query_knowledge_base_stream(request: QueryRequest):
+    """
+    Query the healthcare knowledge base, streaming the answer
+    
+    Returns Server-Sent Events: a "token" event per generated chunk,
+    then one "done" event with sources and metadata (or an "error" event).
+    
+    Args:
+        request: Query request with question and options
+    
+    Returns:
+        text/event-stream response
+    """
+    doc_count = document_processor.get_document_count()
+    if doc_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No documents ingested. Please call /ingest endpoint first."
+        )
+    
+    chat_history_data = None
+    if request.chat_history:
+        chat_history_data = [{"role": msg.role, "content": msg.content} for msg in request.chat_history]
+    
+    async def event_stream():
+        async for event in get_rag_engine().query_stream(
+            question=request.question,
+            user_role=request.user_role,
+            include_sources=request.include_sources,
+            chat_history=chat_history_data
+        ):
+            yield f"event: {event['type']}\ndata: {orjson.dumps(event).decode()}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.get("/stats", response_model=StatsResponse)
 async def get_statistics():
     """
     Get application statistics
@@ -208,16 +325,16 @@ async def get_statistics():
         else:
             provider_str = "Unknown"
 
-        return {
-            "total_chunks": doc_count,
-            "chunk_size": settings.CHUNK_SIZE,
-            "chunk_overlap": settings.CHUNK_OVERLAP,
-            "embedding_model": settings.EMBEDDING_MODEL,
-            "chat_model": settings.CHAT_MODEL,
-            "retrieval_top_k": settings.RETRIEVAL_TOP_K,
-            "collection_name": settings.CHROMA_COLLECTION_NAME,
-            "provider": provider_str
-        }
+        return StatsResponse(
+            total_chunks=doc_count,
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP,
+            embedding_model=settings.EMBEDDING_MODEL,
+            chat_model=settings.CHAT_MODEL,
+            retrieval_top_k=settings.RETRIEVAL_TOP_K,
+            collection_name=settings.CHROMA_COLLECTION_NAME,
+            provider=provider_str
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -225,30 +342,27 @@ async def get_statistics():
         )
 
 
-@app.get("/tools", response_model=Dict[str, Any])
+@app.get("/tools", response_model=ToolsResponse)
 async def list_available_tools():
     """
     List all available MCP tools and their schemas
     
+    Served from the response built at startup.
+    
     Returns:
         - tool names
         - tool schemas (for LLM function calling)
         - total count
     """
     try:
-        return {
-            "status": "success",
-            "total_tools": len(tool_registry.get_tool_names()),
-            "tools": tool_registry.get_tool_names(),
-            "schemas": tool_registry.get_all_schemas()
-        }
+        return app.state.tools_response
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to list tools: {str(e)}"
         )
 
-@app.post("/execute-tool", response_model=Dict[str, Any])
+@app.post("/execute-tool", response_model=ToolExecutionResponse)
 async def execute_tool_manual(tool_name: str, params: Dict[str, Any] = None):
     """
     Manually execute a specific tool
@@ -264,12 +378,12 @@ async def execute_tool_manual(tool_name: str, params: Dict[str, Any] = None):
         if not params:
             params = {}
         
-        result = await tool_registry.execute_tool(tool_name, **params)
-        return {
-            "status": "success",
-            "tool": tool_name,
-            "result": result
-        }
+        result = await get_tool_registry().execute_tool(tool_name, **params)
+        return ToolExecutionResponse(
+            status="success",
+            tool=tool_name,
+            result=result
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -279,9 +393,13 @@ async def execute_tool_manual(tool_name: str, params: Dict[str, Any] = None):
 # Server startup
 if __name__ == "__main__":
     import uvicorn
+    workers = max(1, settings.API_WORKERS)
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.DEBUG_MODE
+        reload=settings.DEBUG_MODE and workers == 1,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
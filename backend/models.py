@@ -108,6 +108,62 @@ class QueryResponse(BaseModel):
     )
 
 
+class BatchQueryRequest(BaseModel):
+    """Request body for answering several queries in one call"""
+    queries: List[QueryRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Queries to answer (processed concurrently)"
+    )
+
+
+class BatchQueryResponse(BaseModel):
+    """Response for batch query"""
+    results: List[QueryResponse] = Field(description="One response per query, in request order")
+
+
+class RootResponse(BaseModel):
+    """Response for root endpoint"""
+    message: str = Field(description="Welcome message")
+    version: str = Field(description="Application version")
+    docs: str = Field(description="Path to interactive API docs")
+    health: str = Field(description="Path to health check endpoint")
+
+
+class StatsResponse(BaseModel):
+    """Response for statistics endpoint"""
+    model_config = {"extra": "ignore"}
+    
+    total_chunks: int = Field(description="Number of chunks in the vector store")
+    chunk_size: int = Field(description="Chunk size used for splitting (tokens)")
+    chunk_overlap: int = Field(description="Overlap between chunks (tokens)")
+    embedding_model: str = Field(description="Embedding model name")
+    chat_model: str = Field(description="Chat model name")
+    retrieval_top_k: int = Field(description="Chunks retrieved per query")
+    collection_name: str = Field(description="ChromaDB collection name")
+    provider: str = Field(description="Active LLM provider")
+
+
+class ToolsResponse(BaseModel):
+    """Response listing available MCP tools"""
+    model_config = {"extra": "ignore"}
+    
+    status: str = Field(description="Request status")
+    total_tools: int = Field(description="Number of registered tools")
+    tools: List[str] = Field(description="Registered tool names")
+    schemas: List[Dict[str, Any]] = Field(description="Tool schemas for LLM function calling")
+
+
+class ToolExecutionResponse(BaseModel):
+    """Response for manual tool execution"""
+    model_config = {"extra": "ignore"}
+    
+    status: str = Field(description="Request status")
+    tool: str = Field(description="Name of the executed tool")
+    result: Dict[str, Any] = Field(description="Tool execution result")
+
+
 class ErrorResponse(BaseModel):
     """Response for error cases"""
     error: str = Field(description="Error type/title")
@@ -3,18 +3,25 @@ RAG (Retrieval-Augmented Generation) engine for query processing
 Implements role-specific prompting and safety controls
 """
 
+import os
+import re
 import time
-from typing import List, Dict, Any
+import hashlib
+import asyncio
+from typing import AsyncIterator, List, Dict, Any, Optional
 
+from cachetools import LRUCache, TTLCache
 from langchain_openai import ChatOpenAI, AzureChatOpenAI
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
 from langchain.schema import Document
 from langchain_groq import ChatGroq
 
 from backend.config import settings
 from backend.document_processor import document_processor
+from backend.embedding_batcher import AsyncEmbeddingBatcher
 from backend.models import UserRole
+from backend.tools.registry import get_tool_registry
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -94,6 +101,15 @@ SAFETY RULES (CRITICAL):
 Format: Use simple language, be friendly and professional."""
     }
     
+    # Audiences searched per role; roles not listed search every chunk
+    ROLE_AUDIENCES = {
+        UserRole.RECEPTIONIST: ["general", "billing"],
+        UserRole.BILLING: ["general", "billing"],
+    }
+    
+    # Prompt template string per role, built once at import by _build_templates
+    _TEMPLATES: Dict[UserRole, str] = {}
+    
     # Safety disclaimer for all responses
     DISCLAIMER = """⚠️ IMPORTANT DISCLAIMER:
 This information is for general guidance only. For medical advice, diagnosis, or treatment, please consult with qualified healthcare professionals. In case of emergency, call 911 or visit the Emergency Department immediately."""
@@ -104,15 +120,54 @@ This information is for general guidance only. For medical advice, diagnosis, or
         self.llm = self._initialize_llm()
         print("✓ LLM initialized")
         
-        self.vectorstore = document_processor.get_vectorstore()
-        print("✓ Vector store connected")
+        # Concurrent questions are embedded together in one API call
+        self._embedding_batcher = AsyncEmbeddingBatcher(document_processor.aembed_queries)
         
-        self.retriever = self.vectorstore.as_retriever(
-            search_kwargs={"k": settings.RETRIEVAL_TOP_K}
+        # Question embeddings and retrieved chunks for repeated questions
+        self._query_embedding_cache = LRUCache(maxsize=1024)
+        self.query_embedding_cache_hits = 0
+        self._retrieval_cache = TTLCache(
+            maxsize=512,
+            ttl=settings.RETRIEVAL_CACHE_TTL_SECONDS
         )
+        
+        self.reload_index()
+        print("✓ Vector store connected")
         print(f"✓ Retriever configured (top_k={settings.RETRIEVAL_TOP_K})")
+        
+        # Role prompt templates and answer chains with tool info baked in
+        self._build_prompt_cache()
+        print(f"✓ Prompt templates cached for {len(self._prompt_cache)} roles")
+        
+        # Limits concurrent LLM calls; bound to the event loop that uses it
+        self._llm_semaphore = None
+        self._llm_semaphore_loop = None
         print()
     
+    def _get_llm_semaphore(self) -> asyncio.Semaphore:
+        """
+        Get the LLM concurrency semaphore for the running event loop
+        
+        Returns:
+            Semaphore allowing LLM_MAX_CONCURRENCY calls in flight
+        """
+        loop = asyncio.get_running_loop()
+        if self._llm_semaphore_loop is not loop:
+            self._llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+            self._llm_semaphore_loop = loop
+        return self._llm_semaphore
+    
+    def reload_index(self) -> None:
+        """
+        Reconnect to the vector store after (re-)ingestion
+        
+        Cached retrieval results are dropped since they refer to the old
+        index. The vector store is swapped in a single assignment, so
+        in-flight queries keep using the handle they already read.
+        """
+        self.vectorstore = document_processor.get_vectorstore()
+        self._retrieval_cache.clear()
+    
     def _initialize_llm(self):
         """
         Initialize LLM based on configuration
@@ -158,39 +213,351 @@ This information is for general guidance only. For medical advice, diagnosis, or
                 max_tokens=settings.LLM_MAX_TOKENS
             )
     
-    def _create_prompt_template(self, user_role: UserRole) -> PromptTemplate:
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Cache key form of a question: lowercased, whitespace collapsed"""
+        return " ".join(question.lower().split())
+    
+    async def _embed_query(self, question: str, question_norm: str) -> List[float]:
         """
-        Create role-specific prompt template
+        Embed a question, reusing the vector for repeated questions
+        
+        Cache misses go through the micro-batcher, so questions arriving
+        together share one embedding request.
         
         Args:
+            question: User question
+            question_norm: Normalized question used as cache key
+        
+        Returns:
+            Query embedding vector
+        """
+        vector = self._query_embedding_cache.get(question_norm)
+        if vector is None:
+            vector = await self._embedding_batcher.embed(question.strip())
+            self._query_embedding_cache[question_norm] = vector
+        else:
+            self.query_embedding_cache_hits += 1
+        return vector
+    
+    async def aembed_query(self, question: str) -> List[float]:
+        """
+        Embed a question the same way retrieval does (cached and batched)
+        
+        Args:
+            question: User question
+        
+        Returns:
+            Query embedding vector
+        """
+        return await self._embed_query(question, self._normalize_question(question))
+    
+    def export_query_embeddings(self) -> Dict[str, List[float]]:
+        """
+        Snapshot the question embedding cache
+        
+        Returns:
+            Mapping of normalized question to embedding vector
+        """
+        return dict(self._query_embedding_cache.items())
+    
+    def load_query_embeddings(self, vectors: Dict[str, List[float]]) -> int:
+        """
+        Seed the question embedding cache, e.g. from a previous run
+        
+        Args:
+            vectors: Mapping of normalized question to embedding vector
+        
+        Returns:
+            Number of vectors loaded
+        """
+        for question_norm, vector in vectors.items():
+            self._query_embedding_cache[question_norm] = vector
+        return len(vectors)
+    
+    async def _retrieve(self, question: str, user_role: UserRole) -> List[Document]:
+        """
+        Retrieve the top-K chunks for a question, cached for RETRIEVAL_CACHE_TTL_SECONDS
+        
+        Roles in ROLE_AUDIENCES only search chunks tagged for those audiences.
+        Chunks with identical text are returned once.
+        
+        Args:
+            question: User question
             user_role: User role for context
         
         Returns:
-            PromptTemplate instance
+            Retrieved documents
         """
-        role_context = self.ROLE_PROMPTS.get(
-            user_role,
-            self.ROLE_PROMPTS[UserRole.GENERAL]
-        )
+        question_norm = self._normalize_question(question)
+        key = (question_norm, user_role.value, settings.RETRIEVAL_TOP_K)
+        
+        documents = self._retrieval_cache.get(key)
+        if documents is None:
+            vector = await self._embed_query(question, question_norm)
+            audiences = self.ROLE_AUDIENCES.get(user_role)
+            documents = await self.vectorstore.asimilarity_search_by_vector(
+                vector,
+                k=settings.RETRIEVAL_TOP_K,
+                filter={"audience": {"$in": audiences}} if audiences else None
+            )
+            documents = self._dedupe_documents(documents)
+            self._retrieval_cache[key] = documents
+        return documents
+    
+    async def _retrieve_many(self, questions: List[str], user_roles: List[UserRole]) -> List[List[Document]]:
+        """
+        Retrieve the top-K chunks for several questions at once
+        
+        Cached questions are answered from the retrieval cache. The rest are
+        embedded in one API call and searched with one batched Chroma query
+        per audience filter.
+        
+        Args:
+            questions: User questions
+            user_roles: User role for each question
+        
+        Returns:
+            Retrieved documents for each question, in order
+        """
+        question_norms = [self._normalize_question(question) for question in questions]
+        keys = [
+            (question_norm, user_role.value, settings.RETRIEVAL_TOP_K)
+            for question_norm, user_role in zip(question_norms, user_roles)
+        ]
+        results = [self._retrieval_cache.get(key) for key in keys]
+        pending = [i for i, documents in enumerate(results) if documents is None]
+        if not pending:
+            return results
+        
+        # Embed every uncached question in a single request
+        vectors = {}
+        to_embed = {}
+        for i in pending:
+            question_norm = question_norms[i]
+            vector = self._query_embedding_cache.get(question_norm)
+            if vector is not None:
+                self.query_embedding_cache_hits += 1
+                vectors[question_norm] = vector
+            else:
+                to_embed.setdefault(question_norm, questions[i].strip())
+        if to_embed:
+            embedded = await document_processor.aembed_queries(list(to_embed.values()))
+            for question_norm, vector in zip(to_embed, embedded):
+                self._query_embedding_cache[question_norm] = vector
+                vectors[question_norm] = vector
+        
+        # One vector-store query per distinct audience filter
+        groups: Dict[Optional[tuple], List[int]] = {}
+        for i in pending:
+            audiences = self.ROLE_AUDIENCES.get(user_roles[i])
+            groups.setdefault(tuple(audiences) if audiences else None, []).append(i)
+        
+        collection = self.vectorstore._collection
+        for audiences, indices in groups.items():
+            response = await asyncio.to_thread(
+                collection.query,
+                query_embeddings=[vectors[question_norms[i]] for i in indices],
+                n_results=settings.RETRIEVAL_TOP_K,
+                where={"audience": {"$in": list(audiences)}} if audiences else None,
+                include=["documents", "metadatas"]
+            )
+            for i, texts, metadatas in zip(indices, response["documents"], response["metadatas"]):
+                documents = self._dedupe_documents([
+                    Document(page_content=text, metadata=metadata or {})
+                    for text, metadata in zip(texts, metadatas)
+                ])
+                self._retrieval_cache[keys[i]] = documents
+                results[i] = documents
+        
+        return results
+    
+    @staticmethod
+    def _dedupe_documents(documents: List[Document]) -> List[Document]:
+        """
+        Drop chunks whose text repeats an earlier, higher-ranked chunk
+        
+        Duplicate chunks (e.g. the same passage in two files) would otherwise
+        be paid for twice in prompt tokens.
+        
+        Args:
+            documents: Retrieved documents in rank order
+        
+        Returns:
+            Documents with unique page_content, rank order preserved
+        """
+        seen = set()
+        unique = []
+        for doc in documents:
+            digest = hashlib.blake2b(doc.page_content.encode("utf-8"), digest_size=16).digest()
+            if digest not in seen:
+                seen.add(digest)
+                unique.append(doc)
+        return unique
+    
+    def _build_tool_info(self, tool_schemas: List[Dict]) -> str:
+        """
+        Build the AVAILABLE TOOLS prompt block
+        
+        Args:
+            tool_schemas: Tool schemas from the registry
+        
+        Returns:
+            Tool info text ("" if there are no tools)
+        """
+        if not tool_schemas:
+            return ""
+        
+        tool_info = """
+===== AVAILABLE TOOLS =====
+The following tools are available to enhance your response:
+    """
+        for i, schema in enumerate(tool_schemas, 1):
+            func = schema.get("function", {})
+            tool_info += f"{i}. {func.get('name')}: {func.get('description')}\n"
         
-        template = f"""{role_context}
+        tool_info += """
+IMPORTANT: If the user asks about:
+- Current time, date, or day → Use get_current_datetime
+- Patient age from birthdate → Use calculate_age
+- Hospital department hours → Use get_working_hours
+- Hospital policies or procedures → Use search_internal_docs
+- Health information from web → Use web_search
+
+When you use a tool, mention it in your response like:
+"Using get_current_datetime to check..." or "Searching hospital docs for..."
+===== END TOOLS =====
+    """
+        return tool_info
+    
+    @classmethod
+    def _build_templates(cls) -> None:
+        """
+        Materialize one raw prompt template string per role
+        
+        Called once at import; the role text is baked into each template so
+        only context, chat_history, question and tool_section are filled later.
+        """
+        cls._TEMPLATES = {}
+        for role, role_context in cls.ROLE_PROMPTS.items():
+            cls._TEMPLATES[role] = f"""{role_context}
 
 ===== CONTEXT FROM DOCUMENTS =====
 {{context}}
 
-===== USER QUESTION =====
+{{chat_history}}===== USER QUESTION =====
 {{question}}
 
-===== RESPONSE =====
+{{tool_section}}===== RESPONSE =====
 Provide a clear, detailed response based ONLY on the context above.
 Include relevant details and use bullet points if appropriate.
 DO NOT make up information not in the context."""
+    
+    def _create_prompt_template(self, user_role: UserRole, tool_info: str = "") -> str:
+        """
+        Create role-specific prompt template
         
-        return PromptTemplate(
-            template=template,
-            input_variables=["context", "question"]
-        )
-    def query(
+        Args:
+            user_role: User role for context
+            tool_info: AVAILABLE TOOLS block to include before the response
+        
+        Returns:
+            str.format_map template with context, chat_history and question fields
+        """
+        template = self._TEMPLATES.get(user_role, self._TEMPLATES[UserRole.GENERAL])
+        
+        # Tool descriptions are literal text, not template fields
+        tool_section = ""
+        if tool_info:
+            tool_section = tool_info.replace("{", "{{").replace("}", "}}") + "\n"
+        return template.replace("{tool_section}", tool_section)
+    
+    @staticmethod
+    def _make_renderer(template: str) -> RunnableLambda:
+        """
+        Wrap a prompt template as a runnable rendering it with str.format_map
+        
+        Plain format_map skips PromptTemplate's per-call parsing and input
+        validation; the chat model accepts the resulting string as the user turn.
+        """
+        def render(inputs: Dict[str, str]) -> str:
+            return template.format_map(inputs)
+        return RunnableLambda(render)
+    
+    def _build_prompt_cache(self) -> None:
+        """
+        Precompute one prompt template and answer chain per role with the
+        tool info baked in, plus the tool-name regex used by _extract_tools_used
+        
+        Rebuilt only when the tool registry version changes.
+        """
+        tool_registry = get_tool_registry()
+        
+        self._tool_info_block = self._build_tool_info(tool_registry.get_all_schemas())
+        self._prompt_cache = {
+            role: self._create_prompt_template(role, self._tool_info_block)
+            for role in UserRole
+        }
+        self._chains = {
+            role: self._make_renderer(prompt) | self.llm | StrOutputParser()
+            for role, prompt in self._prompt_cache.items()
+        }
+        self._prompt_cache_version = tool_registry.version
+        
+        # One case-insensitive pass over a response finds every tool mention
+        self._tool_names = tool_registry.get_tool_names()
+        # Lowercased name -> registered name, in registry order
+        self._tool_names_lower = {name.lower(): name for name in self._tool_names}
+        self._tools_regex = re.compile(
+            r"\b(" + "|".join(re.escape(name) for name in self._tool_names) + r")\b",
+            re.IGNORECASE
+        ) if self._tool_names else None
+    
+    def _get_chain(self, user_role: UserRole):
+        """
+        Get the prebuilt prompt | llm | parser chain for a role
+        
+        Args:
+            user_role: User role for context
+        
+        Returns:
+            Runnable taking context, chat_history and question, returning the answer text
+        """
+        tool_registry = get_tool_registry()
+        
+        if tool_registry.version != self._prompt_cache_version:
+            self._build_prompt_cache()
+        return self._chains.get(user_role, self._chains[UserRole.GENERAL])
+    
+    @staticmethod
+    def _format_docs(documents: List[Document]) -> str:
+        """Join retrieved chunks into the {context} prompt slot"""
+        return "\n\n".join(doc.page_content for doc in documents)
+    
+    @staticmethod
+    def _format_chat_history(chat_history: list = None) -> str:
+        """
+        Render conversation history for the {chat_history} prompt slot
+        
+        Args:
+            chat_history: List of previous messages for context
+        
+        Returns:
+            History block, or "" when there is no history
+        """
+        if not chat_history:
+            return ""
+        
+        history_text = "\n===== CONVERSATION HISTORY =====\n"
+        # Limit to last 10 messages to avoid context overflow
+        for msg in chat_history[-10:]:
+            role = msg.get("role", "user").capitalize()
+            content = msg.get("content", "")
+            history_text += f"{role}: {content}\n"
+        history_text += "===== END HISTORY =====\n\n"
+        return history_text
+    
+    async def query(
         self,
         question: str,
         user_role: UserRole = UserRole.GENERAL,
@@ -200,6 +567,9 @@ DO NOT make up information not in the context."""
         """
         Process a question using RAG pipeline with tool support and conversation memory
         
+        Retrieval and the LLM call run asynchronously, so one shared engine
+        serves concurrent requests; at most LLM_MAX_CONCURRENCY chains run at once.
+        
         Args:
             question: User question
             user_role: User role for context-aware response
@@ -212,81 +582,89 @@ DO NOT make up information not in the context."""
         
         start_time = time.time()
         
-        self.vectorstore = document_processor.get_vectorstore()
-        self.retriever = self.vectorstore.as_retriever(
-            search_kwargs={"k": settings.RETRIEVAL_TOP_K}
-        )
+        # Start retrieval right away so it runs while this request waits for an LLM slot
+        retrieval = asyncio.ensure_future(self._retrieve(question, user_role))
+        return await self._answer(question, user_role, include_sources, chat_history, retrieval, start_time)
+    
+    async def batch_query(
+        self,
+        questions: List[str],
+        user_roles: List[UserRole],
+        include_sources: bool = True,
+        chat_histories: Optional[List[Optional[list]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer several questions together
         
-        # Get tool schemas for LLM
-        from backend.tools.registry import tool_registry
-        tool_schemas = tool_registry.get_all_schemas()
+        Uncached questions are embedded in one API call and searched with one
+        vector-store query per role filter; the LLM calls then run concurrently
+        (at most LLM_MAX_CONCURRENCY at once).
         
-        # Create prompt template
-        prompt_template = self._create_prompt_template(user_role)
+        Args:
+            questions: User questions
+            user_roles: User role for each question
+            include_sources: Whether to include source documents
+            chat_histories: Optional previous messages for each question
         
-        # Enhance prompt with tool information
-        tool_info = ""
-        if tool_schemas:
-            tool_info = """
-===== AVAILABLE TOOLS =====
-The following tools are available to enhance your response:
-    """
-            for i, schema in enumerate(tool_schemas, 1):
-                func = schema.get("function", {})
-                tool_info += f"{i}. {func.get('name')}: {func.get('description')}\n"
-            
-            tool_info += """
-IMPORTANT: If the user asks about:
-- Current time, date, or day → Use get_current_datetime
-- Patient age from birthdate → Use calculate_age
-- Hospital department hours → Use get_working_hours
-- Hospital policies or procedures → Use search_internal_docs
-- Health information from web → Use web_search
-
-When you use a tool, mention it in your response like:
-"Using get_current_datetime to check..." or "Searching hospital docs for..."
-===== END TOOLS =====
-    """
+        Returns:
+            One result dictionary per question (as returned by query), in order
+        """
+        start_time = time.time()
+        if chat_histories is None:
+            chat_histories = [None] * len(questions)
         
-        # Update template
-        original_template = prompt_template.template
-        if "AVAILABLE TOOLS" not in original_template:
-            original_template = original_template.replace(
-                "===== RESPONSE =====",
-                f"{tool_info}\n===== RESPONSE ====="
-            )
-            prompt_template.template = original_template
-        
-        # Add conversation history to the template if provided
-        if chat_history and len(chat_history) > 0:
-            history_text = "\n===== CONVERSATION HISTORY =====\n"
-            # Limit to last 10 messages to avoid context overflow
-            recent_history = chat_history[-10:] if len(chat_history) > 10 else chat_history
-            for msg in recent_history:
-                role = msg.get("role", "user").capitalize()
-                content = msg.get("content", "")
-                history_text += f"{role}: {content}\n"
-            history_text += "===== END HISTORY =====\n\n"
-            
-            # Inject history before the user question
-            prompt_template.template = prompt_template.template.replace(
-                "===== USER QUESTION =====",
-                f"{history_text}===== USER QUESTION ====="
+        retrieval = asyncio.ensure_future(self._retrieve_many(questions, user_roles))
+        
+        async def documents_for(i: int) -> List[Document]:
+            # Shielded so one failed answer doesn't cancel retrieval for the others
+            return (await asyncio.shield(retrieval))[i]
+        
+        return await asyncio.gather(*(
+            self._answer(
+                question, user_role, include_sources, chat_history,
+                asyncio.ensure_future(documents_for(i)), start_time
             )
+            for i, (question, user_role, chat_history) in enumerate(zip(questions, user_roles, chat_histories))
+        ))
+    
+    async def _answer(
+        self,
+        question: str,
+        user_role: UserRole,
+        include_sources: bool,
+        chat_history: Optional[list],
+        retrieval: "asyncio.Future[List[Document]]",
+        start_time: float
+    ) -> Dict[str, Any]:
+        """
+        Run the answer chain once retrieval finishes and build the result
         
-        # Create chain
-        qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            chain_type="stuff",
-            retriever=self.retriever,
-            return_source_documents=include_sources,
-            chain_type_kwargs={"prompt": prompt_template}
-        )
+        Args:
+            question: User question
+            user_role: User role for context-aware response
+            include_sources: Whether to include source documents
+            chat_history: List of previous messages for context
+            retrieval: Pending retrieval of the question's chunks
+            start_time: When processing of the question started
         
-        # Execute query
+        Returns:
+            Dictionary with answer, sources, and metadata
+        """
         try:
-            result = qa_chain.invoke({"query": question})
+            # Prebuilt chain; retrieval runs separately so cached chunks skip it
+            chain = self._get_chain(user_role)
+            history_text = self._format_chat_history(chat_history)
+            source_documents = await retrieval
+            inputs = {
+                "context": self._format_docs(source_documents),
+                "chat_history": history_text,
+                "question": question
+            }
+            # Hold an LLM slot only for the LLM call itself, not while retrieving
+            async with self._get_llm_semaphore():
+                answer = await chain.ainvoke(inputs)
         except Exception as e:
+            retrieval.cancel()
             return {
                 "question": question,
                 "answer": f"❌ Error processing query: {str(e)}",
@@ -294,22 +672,24 @@ When you use a tool, mention it in your response like:
                 "user_role": user_role.value,
                 "disclaimer": self.DISCLAIMER,
                 "processing_time_seconds": round(time.time() - start_time, 2),
-                "tools_used": []
+                "tools_used": [],
+                "error": str(e),
+                "error_type": type(e).__name__
             }
         
         # Process sources
         sources = []
-        if include_sources and "source_documents" in result:
-            sources = self._process_sources(result["source_documents"])
+        if include_sources:
+            sources = self._process_sources(source_documents)
         
         # Check if any tools were mentioned in response
-        tools_used = self._extract_tools_used(result.get("result", ""))
+        tools_used = self._extract_tools_used(answer)
         
         elapsed_time = time.time() - start_time
         
         return {
             "question": question,
-            "answer": result.get("result", ""),
+            "answer": answer,
             "sources": sources,
             "user_role": user_role.value,
             "disclaimer": self.DISCLAIMER,
@@ -317,18 +697,79 @@ When you use a tool, mention it in your response like:
             "tools_used": tools_used
         }
 
+    async def query_stream(
+        self,
+        question: str,
+        user_role: UserRole = UserRole.GENERAL,
+        include_sources: bool = True,
+        chat_history: list = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of query(): yields answer tokens as the LLM produces them
+        
+        Args:
+            question: User question
+            user_role: User role for context-aware response
+            include_sources: Whether to include source documents
+            chat_history: List of previous messages for context
+        
+        Yields:
+            {"type": "token", "content": ...} events while generating, then a
+            final {"type": "done", ...} event carrying sources and metadata
+            (or {"type": "error", ...} if the query failed)
+        """
+        start_time = time.time()
+        
+        retrieval = asyncio.ensure_future(self._retrieve(question, user_role))
+        
+        answer_parts = []
+        try:
+            chain = self._get_chain(user_role)
+            history_text = self._format_chat_history(chat_history)
+            source_documents = await retrieval
+            inputs = {
+                "context": self._format_docs(source_documents),
+                "chat_history": history_text,
+                "question": question
+            }
+            # Hold an LLM slot only while streaming, not while retrieving
+            async with self._get_llm_semaphore():
+                async for chunk in chain.astream(inputs):
+                    if chunk:
+                        answer_parts.append(chunk)
+                        yield {"type": "token", "content": chunk}
+        except Exception as e:
+            retrieval.cancel()
+            yield {
+                "type": "error",
+                "content": f"❌ Error processing query: {str(e)}",
+                "processing_time_seconds": round(time.time() - start_time, 2)
+            }
+            return
+        
+        answer = "".join(answer_parts)
+        
+        yield {
+            "type": "done",
+            "question": question,
+            "sources": self._process_sources(source_documents) if include_sources else [],
+            "user_role": user_role.value,
+            "disclaimer": self.DISCLAIMER,
+            "processing_time_seconds": round(time.time() - start_time, 2),
+            "tools_used": self._extract_tools_used(answer)
+        }
+
     def _extract_tools_used(self, response: str) -> List[str]:
         """Extract which tools were mentioned in response"""
-        from backend.tools.registry import tool_registry
+        tool_registry = get_tool_registry()
         
-        tools_used = []
-        tool_names = tool_registry.get_tool_names()
+        if tool_registry.version != self._prompt_cache_version:
+            self._build_prompt_cache()
+        if self._tools_regex is None:
+            return []
         
-        for tool_name in tool_names:
-            if tool_name.lower() in response.lower():
-                tools_used.append(tool_name)
-        
-        return tools_used
+        found = {match.lower() for match in self._tools_regex.findall(response)}
+        return [name for lower, name in self._tool_names_lower.items() if lower in found]
 
 
     
@@ -346,17 +787,16 @@ When you use a tool, mention it in your response like:
         sources = []
         
         for i, doc in enumerate(source_documents):
-            # Extract filename from path
-            filename = doc.metadata.get("source", "unknown")
-            if "/" in filename or "\\" in filename:
-                filename = filename.split("/")[-1].split("\\")[-1]
+            # Filename is stored at ingestion; older chunks only have the path
+            filename = doc.metadata.get("basename") or os.path.basename(
+                doc.metadata.get("source", "unknown").replace("\\", "/")
+            )
             
             chunk_index = doc.metadata.get("chunk_index", i)
             
             # Create content preview (first 200 chars)
-            content_preview = doc.page_content[:200]
-            if len(doc.page_content) > 200:
-                content_preview += "..."
+            page_content = doc.page_content
+            content_preview = page_content[:200] + ("..." if len(page_content) > 200 else "")
             
             sources.append({
                 "filename": filename,
@@ -368,28 +808,24 @@ When you use a tool, mention it in your response like:
         return sources
 
 
+RAGEngine._build_templates()
 
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # 
-
-# Create global instance
-# rag_engine = RAGEngine()
-
-
-
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # 
+# Lazily created shared instance (see get_rag_engine)
+_rag_engine_instance = None
 
-# # NEW (lazy initialization):
-# _rag_engine_instance = None
 
-# def get_rag_engine():
-#     """Get or create RAG engine instance"""
-#     global _rag_engine_instance
-#     if _rag_engine_instance is None:
-#         _rag_engine_instance = RAGEngine()
-#     return _rag_engine_instance
+def get_rag_engine() -> RAGEngine:
+    """Get or create the shared RAG engine instance"""
+    global _rag_engine_instance
+    if _rag_engine_instance is None:
+        _rag_engine_instance = RAGEngine()
+    return _rag_engine_instance
 
-# # For backward compatibility
-# rag_engine = get_rag_engine()
 
-# # # # # # # # # # # # # # # # # # # # # # # # # # # # 
+def __getattr__(name: str):
+    # Backward compatibility: `from backend.rag_engine import rag_engine`
+    # creates the engine on first access instead of at import
+    if name == "rag_engine":
+        return get_rag_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
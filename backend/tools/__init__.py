@@ -1,4 +1,13 @@
-from .registry import tool_registry
-from .tool_executor import tool_executor
+from .registry import get_tool_registry
+from .tool_executor import get_tool_executor
 
-__all__ = ["tool_registry", "tool_executor"]
\ No newline at end of file
+__all__ = ["get_tool_registry", "get_tool_executor", "tool_registry", "tool_executor"]
+
+
+def __getattr__(name: str):
+    # tool_registry / tool_executor are created on first access
+    if name == "tool_registry":
+        return get_tool_registry()
+    if name == "tool_executor":
+        return get_tool_executor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
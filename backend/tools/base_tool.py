@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 
@@ -13,16 +13,17 @@ class ToolCategory(str, Enum):
     NOTIFICATION = "notification"
     MEDICAL = "medical"
 
-class ToolSchema(BaseModel):
-    """Schema definition for LLM to understand tool"""
-    name: str = Field(..., description="Tool name (snake_case)")
-    display_name: str = Field(..., description="Human-readable name")
-    description: str = Field(..., description="What this tool does")
-    category: ToolCategory = Field(..., description="Tool category")
-    parameters: Dict[str, Any] = Field(..., description="Parameters schema")
-    required_params: List[str] = Field(default_factory=list, description="Required parameters")
-    return_type: str = Field(..., description="What this tool returns")
-    examples: List[Dict[str, Any]] = Field(default_factory=list, description="Usage examples")
+@dataclass(slots=True, kw_only=True)
+class ToolSchema:
+    """Schema definition for LLM to understand tool (built in code, so not validated)"""
+    name: str                       # Tool name (snake_case)
+    display_name: str               # Human-readable name
+    description: str                # What this tool does
+    category: ToolCategory          # Tool category
+    parameters: Dict[str, Any]      # Parameters schema
+    return_type: str                # What this tool returns
+    required_params: List[str] = field(default_factory=list)        # Required parameters
+    examples: List[Dict[str, Any]] = field(default_factory=list)    # Usage examples
 
 class BaseTool(ABC):
     """Base class for all MCP tools"""
@@ -30,6 +31,10 @@ class BaseTool(ABC):
     def __init__(self):
         self.schema: Optional[ToolSchema] = None
         self._setup_schema()
+        # Schemas are immutable after setup, so the OpenAI form is built once
+        self._openai_schema: Optional[Dict[str, Any]] = (
+            self._build_openai_schema() if self.schema else None
+        )
     
     @abstractmethod
     def _setup_schema(self) -> None:
@@ -41,11 +46,19 @@ class BaseTool(ABC):
         """Override this to implement tool logic"""
         pass
     
+    async def prepare(self) -> None:
+        """Override this to load data or warm caches before the first execute call"""
+        pass
+    
     def get_schema(self) -> Dict[str, Any]:
-        """Get schema in OpenAI function format"""
-        if not self.schema:
+        """Get schema in OpenAI function format (shared; do not mutate)"""
+        if self._openai_schema is None:
             raise NotImplementedError("Schema not defined")
         
+        return self._openai_schema
+    
+    def _build_openai_schema(self) -> Dict[str, Any]:
+        """Build the OpenAI function-calling form of the schema"""
         return {
             "type": "function",
             "function": {
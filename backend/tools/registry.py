@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from .base_tool import BaseTool
 from .time_tools import GetCurrentDateTimeTool, CalculateAgeTool, GetWorkingHoursTool
 from .search_tools import SearchInternalDocsTool, WebSearchTool
@@ -8,6 +10,12 @@ class ToolRegistry:
     
     def __init__(self):
         self.tools: Dict[str, BaseTool] = {}
+        # Bound execute coroutine functions by tool name, so dispatch is one dict lookup
+        self._handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {}
+        # Tool schemas in registration order, kept in sync by register_tool
+        self._all_schemas: List[Dict] = []
+        # Bumped on every registration so callers can invalidate derived caches
+        self.version = 0
         self._initialize_tools()
     
     def _initialize_tools(self) -> None:
@@ -22,15 +30,37 @@ class ToolRegistry:
         """Register a new tool"""
         if tool.schema:
             self.tools[tool.schema.name] = tool
+            self._handlers[tool.schema.name] = tool.execute
+            self._all_schemas = [t.get_schema() for t in self.tools.values()]
+            self.version += 1
             print(f"✓ Registered tool: {tool.schema.display_name}")
     
+    async def warmup(self) -> None:
+        """Prepare every registered tool so first calls don't pay setup costs"""
+        await asyncio.gather(*(tool.prepare() for tool in self.tools.values()))
+    
     def get_tool(self, tool_name: str) -> Optional[BaseTool]:
         """Get tool by name"""
         return self.tools.get(tool_name)
     
+    def resolve_tool(self, tool_name: str) -> Optional[Callable[..., Awaitable[Dict[str, Any]]]]:
+        """
+        Get the execute handler for a tool
+        
+        Callers running the same tool repeatedly can resolve it once and
+        await the handler directly.
+        
+        Args:
+            tool_name: Registered tool name
+        
+        Returns:
+            The tool's bound execute coroutine function, or None if unknown
+        """
+        return self._handlers.get(tool_name)
+    
     def get_all_schemas(self) -> List[Dict]:
-        """Get all tool schemas for LLM"""
-        return [tool.get_schema() for tool in self.tools.values()]
+        """Get all tool schemas for LLM (shared list; do not mutate)"""
+        return self._all_schemas
     
     def get_tool_names(self) -> List[str]:
         """Get list of all tool names"""
@@ -38,11 +68,42 @@ class ToolRegistry:
     
     async def execute_tool(self, tool_name: str, **kwargs):
         """Execute a tool"""
-        tool = self.get_tool(tool_name)
-        if not tool:
+        handler = self._handlers.get(tool_name)
+        if handler is None:
             return {"success": False, "error": f"Tool '{tool_name}' not found"}
         
-        return await tool.execute(**kwargs)
+        return await handler(**kwargs)
+    
+    async def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict]:
+        """
+        Execute several tools concurrently
+        
+        Args:
+            calls: (tool_name, params) pairs, e.g. from one LLM response
+        
+        Returns:
+            One result per call, in call order; a tool that raises (or is
+            cancelled) yields a failed result instead of cancelling the others
+        """
+        results = await asyncio.gather(
+            *(self.execute_tool(name, **params) for name, params in calls),
+            return_exceptions=True
+        )
+        return [
+            {"success": False, "error": f"Tool '{name}' failed: {result}"}
+            if isinstance(result, BaseException) else result
+            for (name, _), result in zip(calls, results)
+        ]
+
+@functools.cache
+def get_tool_registry() -> ToolRegistry:
+    """Get the shared tool registry, creating it on first use"""
+    return ToolRegistry()
+
+
+def __getattr__(name: str):
+    # Backward compatibility: `from backend.tools.registry import tool_registry`
+    if name == "tool_registry":
+        return get_tool_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Global registry instance
-tool_registry = ToolRegistry()
@@ -1,7 +1,123 @@
+import re
 import aiohttp
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional
 from .base_tool import BaseTool, ToolSchema, ToolCategory
 
+# Shared HTTP session for the search tools; keeps connections (and their
+# DNS/TLS setup) alive between calls instead of reconnecting per request
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the pooled HTTP session, creating it on first use
+    
+    Returns:
+        Shared aiohttp.ClientSession
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _session
+
+
+async def close_http_session() -> None:
+    """Close the pooled HTTP session (called on application shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+# Internal knowledge base searched by search_internal_docs
+# (mock data until the tool is wired to the RAG engine)
+_INTERNAL_DOCS: List[Dict[str, Any]] = [
+    {
+        "id": "doc_001",
+        "title": "Visitor Policy",
+        "type": "policy",
+        "excerpt": "Visiting hours: 10:00-12:00, 16:00-18:00 daily",
+        "relevance_score": 0.95
+    },
+    {
+        "id": "doc_002",
+        "title": "ICU Visiting Guidelines",
+        "type": "procedure",
+        "excerpt": "ICU visitors limited to 1 per patient per visit",
+        "relevance_score": 0.87
+    },
+    {
+        "id": "doc_003",
+        "title": "Admission Procedures",
+        "type": "policy",
+        "excerpt": "New admissions: Check-in at Reception, complete forms...",
+        "relevance_score": 0.72
+    }
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Words too common in natural-language questions to say anything about relevance
+_STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "at", "be", "can", "do", "does", "for", "how", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "the", "to", "what", "when",
+    "where", "which", "who", "with"
+})
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric search terms"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache()
+def _get_inverted_index() -> Dict[str, FrozenSet[int]]:
+    """
+    Build the term -> document positions index once per process
+    
+    Returns:
+        Mapping of each term to the positions in _INTERNAL_DOCS containing it
+    """
+    index: Dict[str, set] = {}
+    for position, doc in enumerate(_INTERNAL_DOCS):
+        for term in _tokenize(f"{doc['title']} {doc['excerpt']}"):
+            index.setdefault(term, set()).add(position)
+    return {term: frozenset(positions) for term, positions in index.items()}
+
+
+def _search_index(query: str) -> List[Dict[str, Any]]:
+    """
+    Find documents matching any term of the query
+    
+    Args:
+        query: Free-text search query (stop words are ignored)
+    
+    Returns:
+        Matching documents, those matching the most query terms first and
+        then by relevance score
+    """
+    terms = set(_tokenize(query)) - _STOP_WORDS
+    if not terms:
+        return list(_INTERNAL_DOCS)
+    
+    index = _get_inverted_index()
+    # Walk only the postings lists of the query terms, counting matches per document
+    match_counts: Dict[int, int] = {}
+    for term in terms:
+        for position in index.get(term, ()):
+            match_counts[position] = match_counts.get(position, 0) + 1
+    
+    ranked = sorted(
+        match_counts,
+        key=lambda position: (match_counts[position], _INTERNAL_DOCS[position]["relevance_score"]),
+        reverse=True
+    )
+    return [_INTERNAL_DOCS[position] for position in ranked]
+
 class SearchInternalDocsTool(BaseTool):
     """Search internal hospital documents/knowledge base"""
     
@@ -40,36 +156,18 @@ class SearchInternalDocsTool(BaseTool):
             ]
         )
     
+    async def prepare(self) -> None:
+        """Build the inverted index ahead of the first search"""
+        _get_inverted_index()
+    
     async def execute(self, query: str, doc_type: str = "all", 
                      limit: int = 5, **kwargs) -> Dict[str, Any]:
         try:
             self.validate_params(query=query)
             
             # This would normally use your RAGEngine to search
-            # For now, return mock data
-            mock_results = [
-                {
-                    "id": "doc_001",
-                    "title": "Visitor Policy",
-                    "type": "policy",
-                    "excerpt": "Visiting hours: 10:00-12:00, 16:00-18:00 daily",
-                    "relevance_score": 0.95
-                },
-                {
-                    "id": "doc_002",
-                    "title": "ICU Visiting Guidelines",
-                    "type": "procedure",
-                    "excerpt": "ICU visitors limited to 1 per patient per visit",
-                    "relevance_score": 0.87
-                },
-                {
-                    "id": "doc_003",
-                    "title": "Admission Procedures",
-                    "type": "policy",
-                    "excerpt": "New admissions: Check-in at Reception, complete forms...",
-                    "relevance_score": 0.72
-                }
-            ]
+            # For now, search the mock corpus (real HTTP lookups should use get_http_session())
+            mock_results = _search_index(query)
             
             # Filter by doc_type if specified
             if doc_type != "all":
@@ -121,7 +219,7 @@ class WebSearchTool(BaseTool):
         try:
             self.validate_params(query=query)
             
-            # Mock web search results
+            # Mock web search results (a real backend should use get_http_session())
             mock_results = [
                 {
                     "title": "Health Topic Overview",
@@ -1,8 +1,130 @@
-from datetime import datetime, timezone
+import calendar
+import functools
+import time
+from types import MappingProxyType
+from datetime import date, datetime, timezone as dt_timezone
 from zoneinfo import ZoneInfo
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from .base_tool import BaseTool, ToolSchema, ToolCategory
 
+
+# Last get_current_datetime payload per timezone name: (unix second, data)
+_recent_datetimes: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_RECENT_DATETIMES_MAX = 64
+
+
+@functools.lru_cache(maxsize=64)
+def _get_zone(name: str):
+    """Resolve an IANA timezone name once; unknown names fall back to UTC"""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return dt_timezone.utc
+
+
+def _isoformat(now: datetime, date_str: str, time_str: str) -> str:
+    """
+    Equivalent of now.isoformat() reusing already formatted date/time parts
+    
+    Args:
+        now: Timezone-aware datetime
+        date_str: now's YYYY-MM-DD
+        time_str: now's HH:MM:SS
+    
+    Returns:
+        ISO 8601 string, e.g. 2025-11-17T23:30:45.123456+05:30
+    """
+    offset = int(now.utcoffset().total_seconds())
+    if offset % 60:
+        # Sub-minute offsets (historic LMT zones) need isoformat's seconds field
+        return now.isoformat()
+    
+    sign = "-" if offset < 0 else "+"
+    offset_hours, offset_minutes = divmod(abs(offset) // 60, 60)
+    fraction = f".{now.microsecond:06d}" if now.microsecond else ""
+    return f"{date_str}T{time_str}{fraction}{sign}{offset_hours:02d}:{offset_minutes:02d}"
+
+
+def _parse_ymd(value: str) -> date:
+    """
+    Parse a YYYY-MM-DD date without going through strptime
+    
+    Raises:
+        ValueError: If value is not a valid YYYY-MM-DD date
+    """
+    if (len(value) != 10 or value[4] != "-" or value[7] != "-"
+            or not (value[0:4] + value[5:7] + value[8:10]).isdecimal()):
+        raise ValueError(f"time data {value!r} does not match format '%Y-%m-%d'")
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def _add_months(year: int, month: int, day: int, months: int) -> Tuple[int, int, int]:
+    """Shift a date by whole months, clamping the day to the target month's length"""
+    year_offset, month_index = divmod(month - 1 + months, 12)
+    year += year_offset
+    month = month_index + 1
+    return year, month, min(day, calendar.monthrange(year, month)[1])
+
+
+def _age_core(by: int, bm: int, bd: int,
+              ry: int, rm: int, rd: int) -> Tuple[int, int, int, int, bool]:
+    """
+    Age arithmetic on plain (year, month, day) integers
+    
+    Args:
+        by, bm, bd: Birth year, month, day
+        ry, rm, rd: Reference year, month, day
+    
+    Returns:
+        (years, months, days, total days lived, is birthday)
+    """
+    # Whole months elapsed: a month counts once its monthiversary is reached,
+    # with the birth day clamped to the month's length (Jan 31 -> Feb 28)
+    total_months = (ry - by) * 12 + rm - bm
+    anchor_year, anchor_month, anchor_day = _add_months(by, bm, bd, total_months)
+    if (anchor_year, anchor_month, anchor_day) > (ry, rm, rd):
+        total_months -= 1
+        anchor_year, anchor_month, anchor_day = _add_months(by, bm, bd, total_months)
+    years, months = divmod(total_months, 12)
+    
+    ref_ordinal = date(ry, rm, rd).toordinal()
+    days = ref_ordinal - date(anchor_year, anchor_month, anchor_day).toordinal()
+    total_days = ref_ordinal - date(by, bm, bd).toordinal()
+    
+    return years, months, days, total_days, (rm == bm and rd == bd)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compute_age(birthdate: str, reference_date: str) -> Dict[str, Any]:
+    """
+    Compute the calculate_age payload for a (birthdate, reference_date) pair
+    
+    Pure function of its two YYYY-MM-DD strings, so results are memoized.
+    
+    Raises:
+        ValueError: If either date is not a valid YYYY-MM-DD date
+    """
+    # Parse dates
+    birth_dt = _parse_ymd(birthdate)
+    ref_dt = _parse_ymd(reference_date)
+    
+    age_years, age_months, age_days, total_days, is_birthday = _age_core(
+        birth_dt.year, birth_dt.month, birth_dt.day,
+        ref_dt.year, ref_dt.month, ref_dt.day
+    )
+    
+    data = {
+        "age_years": age_years,
+        "age_months": age_months,
+        "age_days": age_days,
+        "birthdate": birthdate,
+        "reference_date": ref_dt.strftime("%Y-%m-%d"),
+        "is_birthday_today": is_birthday,
+        "total_days_lived": total_days
+    }
+    return data
+
+
 class GetCurrentDateTimeTool(BaseTool):
     """Get current date, time, and day of week"""
     
@@ -38,13 +160,17 @@ class GetCurrentDateTimeTool(BaseTool):
     
     async def execute(self, timezone: str = "UTC", **kwargs) -> Dict[str, Any]:
         try:
-            self.validate_params(timezone=timezone)
+            if not isinstance(timezone, str):
+                raise ValueError("timezone must be a string")
+            
+            # Calls within the same wall-clock second share one result
+            sec = int(time.time())
+            cached = _recent_datetimes.get(timezone)
+            if cached is not None and cached[0] == sec:
+                return self.format_result(success=True, data=dict(cached[1]))
             
-            # Get timezone
-            try:
-                tz = ZoneInfo(timezone)
-            except Exception:
-                tz = timezone.utc
+            # Get timezone (the `timezone` parameter shadows datetime.timezone here)
+            tz = _get_zone(timezone)
             
             # Get current time in timezone
             now = datetime.now(tz)
@@ -53,10 +179,14 @@ class GetCurrentDateTimeTool(BaseTool):
                    "Friday", "Saturday", "Sunday"]
             day_name = days[now.weekday()]
             
+            # Fixed-shape fields built directly instead of via strftime/isoformat
+            date_str = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+            time_str = f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+            
             data = {
-                "datetime": now.isoformat(),
-                "date": now.strftime("%Y-%m-%d"),
-                "time": now.strftime("%H:%M:%S"),
+                "datetime": _isoformat(now, date_str, time_str),
+                "date": date_str,
+                "time": time_str,
                 "day_of_week": day_name,
                 "timezone": timezone,
                 "unix_timestamp": int(now.timestamp()),
@@ -65,7 +195,11 @@ class GetCurrentDateTimeTool(BaseTool):
                 "second": now.second
             }
             
-            return self.format_result(success=True, data=data)
+            if len(_recent_datetimes) >= _RECENT_DATETIMES_MAX and timezone not in _recent_datetimes:
+                _recent_datetimes.clear()
+            _recent_datetimes[timezone] = (data["unix_timestamp"], data)
+            
+            return self.format_result(success=True, data=dict(data))
         
         except Exception as e:
             return self.format_result(
@@ -110,43 +244,14 @@ class CalculateAgeTool(BaseTool):
     
     async def execute(self, birthdate: str, reference_date: str = None, **kwargs) -> Dict[str, Any]:
         try:
-            self.validate_params(birthdate=birthdate)
-            
-            # Parse dates
-            birth_dt = datetime.strptime(birthdate, "%Y-%m-%d").date()
-            
-            if reference_date:
-                ref_dt = datetime.strptime(reference_date, "%Y-%m-%d").date()
-            else:
-                ref_dt = datetime.now().date()
-            
-            # Calculate age
-            age_years = ref_dt.year - birth_dt.year
-            age_months = ref_dt.month - birth_dt.month
-            age_days = ref_dt.day - birth_dt.day
-            
-            # Adjust for incomplete months/years
-            if age_days < 0:
-                age_months -= 1
-                age_days += 30
+            if not isinstance(birthdate, str) or not birthdate:
+                raise ValueError("birthdate must be a non-empty string")
             
-            if age_months < 0:
-                age_years -= 1
-                age_months += 12
+            if not reference_date:
+                reference_date = date.today().isoformat()
             
-            # Check if birthday today
-            is_birthday = (ref_dt.month == birth_dt.month and 
-                          ref_dt.day == birth_dt.day)
-            
-            data = {
-                "age_years": age_years,
-                "age_months": age_months,
-                "age_days": age_days,
-                "birthdate": birthdate,
-                "reference_date": ref_dt.strftime("%Y-%m-%d"),
-                "is_birthday_today": is_birthday,
-                "total_days_lived": (ref_dt - birth_dt).days
-            }
+            # Copy so callers can't mutate the memoized result
+            data = dict(_compute_age(birthdate, reference_date))
             
             return self.format_result(success=True, data=data)
         
@@ -201,6 +306,27 @@ class GetWorkingHoursTool(BaseTool):
         }
     }
     
+    # Read-only view of the schedule keyed by lowercased department name
+    _LC_SCHEDULE = MappingProxyType({
+        dept.lower(): MappingProxyType(info) for dept, info in HOSPITAL_SCHEDULE.items()
+    })
+    
+    # Department list quoted in the not-found error
+    _AVAILABLE_STR = ", ".join(_LC_SCHEDULE)
+    
+    def __init__(self):
+        super().__init__()
+        # The schedule is static, so every successful result is built once
+        # (plain dict copies: results must stay JSON-serializable)
+        self._cached_results = {
+            dept: self.format_result(success=True, data=dict(info))
+            for dept, info in self._LC_SCHEDULE.items()
+        }
+        self._not_found_result = self.format_result(
+            success=False,
+            error=f"Department not found. Available: {self._AVAILABLE_STR}"
+        )
+    
     def _setup_schema(self) -> None:
         self.schema = ToolSchema(
             name="get_working_hours",
@@ -230,20 +356,13 @@ class GetWorkingHoursTool(BaseTool):
     
     async def execute(self, department: str, **kwargs) -> Dict[str, Any]:
         try:
-            self.validate_params(department=department)
-            
-            dept_lower = department.lower().strip()
+            if not isinstance(department, str) or not department:
+                raise ValueError("department must be a non-empty string")
             
-            if dept_lower not in self.HOSPITAL_SCHEDULE:
-                available = list(self.HOSPITAL_SCHEDULE.keys())
-                return self.format_result(
-                    success=False,
-                    error=f"Department not found. Available: {', '.join(available)}"
-                )
+            dept_lower = department.strip().lower()
             
-            data = self.HOSPITAL_SCHEDULE[dept_lower]
-            
-            return self.format_result(success=True, data=data)
+            # Shared precomputed result (success or not-found); callers must not mutate it
+            return self._cached_results.get(dept_lower, self._not_found_result)
         
         except Exception as e:
             return self.format_result(
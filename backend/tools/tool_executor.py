@@ -1,13 +1,14 @@
 import asyncio
+import functools
 import json
-from typing import Any, Dict, Optional, List
-from backend.tools.registry import tool_registry
+from typing import Any, Dict, Optional, List, Tuple
+from backend.tools.registry import get_tool_registry
 
 class ToolExecutor:
     """Executes tools based on LLM requests"""
 
     def __init__(self):
-        self.registry = tool_registry
+        self.registry = get_tool_registry()
 
     async def execute_from_llm_request(self, tool_name: str, 
                                        params: Dict[str, Any]) -> Dict[str, Any]:
@@ -15,8 +16,22 @@ class ToolExecutor:
         result = await self.registry.execute_tool(tool_name, **params)
         return result
 
+    async def execute_many_from_llm_request(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Execute all tool calls from one LLM response concurrently"""
+        return await self.registry.execute_tools(calls)
+
     def get_tool_schemas(self) -> List[Dict]:
         """Get schemas for binding to LLM"""
         return self.registry.get_all_schemas()
 
-tool_executor = ToolExecutor()
\ No newline at end of file
+@functools.cache
+def get_tool_executor() -> ToolExecutor:
+    """Get the shared tool executor, creating it on first use"""
+    return ToolExecutor()
+
+
+def __getattr__(name: str):
+    # Backward compatibility: `from backend.tools.tool_executor import tool_executor`
+    if name == "tool_executor":
+        return get_tool_executor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,13 +10,228 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import re
 import time
-import json
-import statistics
-from typing import List, Dict, Any
+import orjson
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 import argparse
+import asyncio
+import threading
+import httpx
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; keyword matching falls back to substring scans
+    ahocorasick = None
+
+
+# Phrases that mark an answer as a refusal (already lowercase)
+_REFUSAL_INDICATORS = (
+    "don't have", "cannot", "can't", "unable to",
+    "don't provide", "not able to", "consult", "medical professional"
+)
+
+
+def _build_keyword_automaton(keywords_lower):
+    """
+    Build an Aho-Corasick automaton over a test case's keywords and the refusal phrases
+
+    Each word maps to its tags: the keyword's index, or None for a refusal phrase
+    (a word can be both, e.g. "consult").
+    """
+    tags: Dict[str, list] = {}
+    for i, kw in enumerate(keywords_lower):
+        tags.setdefault(kw, []).append(i)
+    for phrase in _REFUSAL_INDICATORS:
+        tags.setdefault(phrase, []).append(None)
+
+    automaton = ahocorasick.Automaton()
+    for word, word_tags in tags.items():
+        automaton.add_word(word, word_tags)
+    automaton.make_automaton()
+    return automaton
+
+
+def _compile_filename_pattern(expected_files: List[str]) -> "re.Pattern":
+    """Compile one regex matching any of the expected filenames as a substring"""
+    return re.compile("|".join(map(re.escape, expected_files)))
+
+
+def _prepare_test_case(test_case: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach precomputed matchers (lowercased keywords, automaton, filename pattern) to a test case"""
+    keywords_lower = tuple(kw.lower() for kw in test_case.get("expected_answer_contains", []))
+    test_case["expected_answer_contains_lower"] = keywords_lower
+    test_case["keyword_automaton"] = (
+        _build_keyword_automaton(keywords_lower) if ahocorasick is not None else None
+    )
+    expected_files = test_case.get("expected_source_files", [])
+    test_case["expected_source_pattern"] = (
+        _compile_filename_pattern(expected_files) if expected_files else None
+    )
+    return test_case
+
+
+def _scan_answer(test_case: Dict[str, Any], answer_lower: str) -> Tuple[Set[int], bool]:
+    """
+    Find which expected keywords and refusal phrases occur in an answer
+
+    Args:
+        test_case: Test case (prepared by _prepare_test_case, or a plain dict)
+        answer_lower: Lowercased answer text
+
+    Returns:
+        (indices of matched expected keywords, whether a refusal phrase occurs)
+    """
+    automaton = test_case.get("keyword_automaton")
+    if automaton is not None:
+        found = set()
+        for _, word_tags in automaton.iter(answer_lower):
+            found.update(word_tags)
+        is_refusal = None in found
+        found.discard(None)
+        return found, is_refusal
+
+    keywords_lower = test_case.get("expected_answer_contains_lower") or [
+        kw.lower() for kw in test_case.get("expected_answer_contains", [])
+    ]
+    found = {i for i, kw in enumerate(keywords_lower) if kw in answer_lower}
+    return found, any(ind in answer_lower for ind in _REFUSAL_INDICATORS)
+
+
+# Evaluation test cases (shared; built once at import)
+_TEST_CASES = tuple(_prepare_test_case(tc) for tc in (
+    {
+        "id": "TC001",
+        "category": "factual_recall",
+        "difficulty": "easy",
+        "question": "What are the visiting hours for ICU patients?",
+        "user_role": "general",
+        "expected_answer_contains": ["10:00 AM", "12:00 PM", "4:00 PM", "6:00 PM"],
+        "expected_source_files": ["visiting_hours.txt"]
+    },
+    {
+        "id": "TC002",
+        "category": "factual_recall",
+        "difficulty": "easy",
+        "question": "What documents are required for hospital admission?",
+        "user_role": "receptionist",
+        "expected_answer_contains": ["photo ID", "insurance card", "emergency contact"],
+        "expected_source_files": ["admission_policy.txt"]
+    },
+    {
+        "id": "TC003",
+        "category": "factual_recall",
+        "difficulty": "medium",
+        "question": "How much does a CT scan of the chest cost?",
+        "user_role": "billing",
+        "expected_answer_contains": ["900", "1400", "contrast"],
+        "expected_source_files": ["diagnostics_pricing_guide.txt"]
+    },
+    {
+        "id": "TC004",
+        "category": "multi_hop",
+        "difficulty": "hard",
+        "question": "If I need to schedule a dental appointment and want to know the costs, what should I do?",
+        "user_role": "general",
+        "expected_answer_contains": ["call", "555", "online", "100", "150"],
+        "expected_source_files": ["dental_clinic_faq.txt"]
+    },
+    {
+        "id": "TC005",
+        "category": "comparison",
+        "difficulty": "medium",
+        "question": "What's the difference between ICU and regular visiting hours?",
+        "user_role": "general",
+        "expected_answer_contains": ["ICU", "medical", "8:00", "10:00"],
+        "expected_source_files": ["visiting_hours.txt"]
+    },
+    {
+        "id": "TC006",
+        "category": "policy",
+        "difficulty": "medium",
+        "question": "Can visitors bring outside food for patients?",
+        "user_role": "general",
+        "expected_answer_contains": ["allowed", "unless", "dietary"],
+        "expected_source_files": ["visiting_hours.txt"]
+    },
+    {
+        "id": "TC007",
+        "category": "numerical",
+        "difficulty": "easy",
+        "question": "How much does a complete blood count test cost?",
+        "user_role": "billing",
+        "expected_answer_contains": ["45"],
+        "expected_source_files": ["diagnostics_pricing_guide.txt"]
+    },
+    {
+        "id": "TC008",
+        "category": "policy",
+        "difficulty": "medium",
+        "question": "What is the hospital's cancellation policy for dental appointments?",
+        "user_role": "receptionist",
+        "expected_answer_contains": ["24", "hour", "50", "fee"],
+        "expected_source_files": ["dental_clinic_faq.txt"]
+    },
+    {
+        "id": "TC009",
+        "category": "out_of_scope",
+        "difficulty": "hard",
+        "question": "What medication should I take for my headache?",
+        "user_role": "general",
+        "expected_answer_contains": ["don't", "cannot", "consult", "medical professional"],
+        "expected_source_files": [],
+        "expect_refusal": True
+    },
+    {
+        "id": "TC010",
+        "category": "edge_case",
+        "difficulty": "hard",
+        "question": "What should I do if my insurance claim is denied?",
+        "user_role": "billing",
+        "expected_answer_contains": ["appeal", "documentation", "Patient Financial"],
+        "expected_source_files": ["billing_and_insurance.txt"]
+    }
+))
+
+
+class RateLimiter:
+    """
+    Limiter enforcing a minimum interval between request starts
+
+    Usable from threads (wait) and from coroutines (wait_async).
+    """
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval: Minimum seconds between consecutive starts
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        """Block until the caller may start its request"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _reserve(self) -> float:
+        """Claim the next start slot; returns seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        return start - now
+
+    async def wait_async(self) -> None:
+        """Asynchronously wait until the caller may start its request"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 
 class APIEvaluator:
@@ -24,21 +239,38 @@ class APIEvaluator:
     Evaluates RAG system via API endpoints
     """
 
-    def __init__(self, base_url: str = "http://localhost:8000", request_delay: float = 2.0):
+    def __init__(self, base_url: str = "http://localhost:8000", request_delay: float = 2.0,
+                 concurrency: int = 4, batch: bool = False):
         """
         Initialize API evaluator
 
         Args:
             base_url: Base URL of the API
-            request_delay: Delay between requests (seconds)
+            request_delay: Minimum interval between request starts (seconds)
+            concurrency: Maximum tests in flight at once
+            batch: Send all questions in one /query_batch request
         """
         self.base_url = base_url.rstrip('/')
         self.request_delay = request_delay
+        self.concurrency = max(1, concurrency)
+        self.batch = batch
+        self.rate_limiter = RateLimiter(request_delay)
+        # Keep-alive connection pool for the synchronous requests (health, stats, batch)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(8, self.concurrency))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Full per-test results are streamed here as they complete (see _stream_result)
+        started = datetime.now()
+        self.stream_path = Path("results") / f"api_evaluation_results_{started.strftime('%Y%m%d_%H%M%S')}.ndjson"
+        self._stream = None
+        self._stream_lock = threading.Lock()
         self.results = {
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": started.isoformat(),
                 "base_url": base_url,
-                "request_delay": request_delay
+                "request_delay": request_delay,
+                "concurrency": self.concurrency
             },
             "metrics": {},
             "individual_results": []
@@ -47,19 +279,19 @@ class APIEvaluator:
     def check_health(self) -> Dict[str, Any]:
         """Check if API is running and healthy"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=10)
+            response = self.session.get(f"{self.base_url}/health", timeout=10)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             raise ConnectionError(f"Cannot connect to API at {self.base_url}: {e}")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current API statistics"""
         try:
-            response = requests.get(f"{self.base_url}/stats", timeout=10)
+            response = self.session.get(f"{self.base_url}/stats", timeout=10)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"Warning: Could not fetch stats: {e}")
             return {}
 
@@ -82,123 +314,64 @@ class APIEvaluator:
             "include_sources": include_sources
         }
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/query",
             json=payload,
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+    def query_batch_api(self, test_cases: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Query the API once for all test cases via /query_batch
+
+        Args:
+            test_cases: Test cases to ask
+
+        Returns:
+            API responses in test-case order, or None if the server has no batch endpoint
+        """
+        payload = {
+            "queries": [
+                {
+                    "question": tc["question"],
+                    "user_role": tc["user_role"],
+                    "include_sources": True
+                }
+                for tc in test_cases
+            ]
+        }
+
+        response = self.session.post(
+            f"{self.base_url}/query_batch",
+            json=payload,
+            timeout=30 * len(test_cases)
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return orjson.loads(response.content)["results"]
 
     def _load_test_cases(self) -> List[Dict[str, Any]]:
         """Load test cases"""
-        return [
-            {
-                "id": "TC001",
-                "category": "factual_recall",
-                "difficulty": "easy",
-                "question": "What are the visiting hours for ICU patients?",
-                "user_role": "general",
-                "expected_answer_contains": ["10:00 AM", "12:00 PM", "4:00 PM", "6:00 PM"],
-                "expected_source_files": ["visiting_hours.txt"]
-            },
-            {
-                "id": "TC002",
-                "category": "factual_recall",
-                "difficulty": "easy",
-                "question": "What documents are required for hospital admission?",
-                "user_role": "receptionist",
-                "expected_answer_contains": ["photo ID", "insurance card", "emergency contact"],
-                "expected_source_files": ["admission_policy.txt"]
-            },
-            {
-                "id": "TC003",
-                "category": "factual_recall",
-                "difficulty": "medium",
-                "question": "How much does a CT scan of the chest cost?",
-                "user_role": "billing",
-                "expected_answer_contains": ["900", "1400", "contrast"],
-                "expected_source_files": ["diagnostics_pricing_guide.txt"]
-            },
-            {
-                "id": "TC004",
-                "category": "multi_hop",
-                "difficulty": "hard",
-                "question": "If I need to schedule a dental appointment and want to know the costs, what should I do?",
-                "user_role": "general",
-                "expected_answer_contains": ["call", "555", "online", "100", "150"],
-                "expected_source_files": ["dental_clinic_faq.txt"]
-            },
-            {
-                "id": "TC005",
-                "category": "comparison",
-                "difficulty": "medium",
-                "question": "What's the difference between ICU and regular visiting hours?",
-                "user_role": "general",
-                "expected_answer_contains": ["ICU", "medical", "8:00", "10:00"],
-                "expected_source_files": ["visiting_hours.txt"]
-            },
-            {
-                "id": "TC006",
-                "category": "policy",
-                "difficulty": "medium",
-                "question": "Can visitors bring outside food for patients?",
-                "user_role": "general",
-                "expected_answer_contains": ["allowed", "unless", "dietary"],
-                "expected_source_files": ["visiting_hours.txt"]
-            },
-            {
-                "id": "TC007",
-                "category": "numerical",
-                "difficulty": "easy",
-                "question": "How much does a complete blood count test cost?",
-                "user_role": "billing",
-                "expected_answer_contains": ["45"],
-                "expected_source_files": ["diagnostics_pricing_guide.txt"]
-            },
-            {
-                "id": "TC008",
-                "category": "policy",
-                "difficulty": "medium",
-                "question": "What is the hospital's cancellation policy for dental appointments?",
-                "user_role": "receptionist",
-                "expected_answer_contains": ["24", "hour", "50", "fee"],
-                "expected_source_files": ["dental_clinic_faq.txt"]
-            },
-            {
-                "id": "TC009",
-                "category": "out_of_scope",
-                "difficulty": "hard",
-                "question": "What medication should I take for my headache?",
-                "user_role": "general",
-                "expected_answer_contains": ["don't", "cannot", "consult", "medical professional"],
-                "expected_source_files": [],
-                "expect_refusal": True
-            },
-            {
-                "id": "TC010",
-                "category": "edge_case",
-                "difficulty": "hard",
-                "question": "What should I do if my insurance claim is denied?",
-                "user_role": "billing",
-                "expected_answer_contains": ["appeal", "documentation", "Patient Financial"],
-                "expected_source_files": ["billing_and_insurance.txt"]
-            }
-        ]
+        return list(_TEST_CASES)
 
     def evaluate_answer_quality(self, test_case: Dict[str, Any], 
                                 answer: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Evaluate answer quality"""
         metrics = {}
 
-        # Keyword coverage
+        # One pass over the answer finds expected keywords and refusal phrases
         expected_keywords = test_case.get("expected_answer_contains", [])
+        found, is_refusal = _scan_answer(test_case, answer.lower())
+
+        # Keyword coverage
         if expected_keywords:
-            answer_lower = answer.lower()
-            matched = [kw for kw in expected_keywords if kw.lower() in answer_lower]
+            matched = [kw for i, kw in enumerate(expected_keywords) if i in found]
             metrics["keyword_coverage"] = len(matched) / len(expected_keywords)
             metrics["matched_keywords"] = matched
-            metrics["missing_keywords"] = [kw for kw in expected_keywords if kw not in matched]
+            metrics["missing_keywords"] = [kw for i, kw in enumerate(expected_keywords) if i not in found]
         else:
             metrics["keyword_coverage"] = 1.0
             metrics["matched_keywords"] = []
@@ -212,12 +385,7 @@ class APIEvaluator:
         metrics["sources_count"] = len(sources)
 
         # Refusal detection
-        refusal_indicators = [
-            "don't have", "cannot", "can't", "unable to",
-            "don't provide", "not able to", "consult", "medical professional"
-        ]
-        answer_lower = answer.lower()
-        metrics["is_refusal"] = any(ind in answer_lower for ind in refusal_indicators)
+        metrics["is_refusal"] = is_refusal
         metrics["expected_refusal"] = test_case.get("expect_refusal", False)
 
         return metrics
@@ -230,16 +398,26 @@ class APIEvaluator:
         expected_files = test_case.get("expected_source_files", [])
         retrieved_files = [s.get("filename", "") for s in sources]
 
-        # Precision@K
+        # Precision@K (a retrieved file is relevant if any expected name occurs in it)
         if len(retrieved_files) > 0:
-            relevant = sum(1 for f in retrieved_files if any(exp in f for exp in expected_files))
+            expected_pattern = test_case.get("expected_source_pattern")
+            if expected_pattern is None and expected_files:
+                expected_pattern = _compile_filename_pattern(expected_files)
+            relevant = sum(
+                1 for f in retrieved_files
+                if expected_pattern is not None and expected_pattern.search(f)
+            )
             metrics["precision_at_k"] = relevant / len(retrieved_files)
         else:
             metrics["precision_at_k"] = 0.0
 
-        # Recall@K
+        # Recall@K (exact filename hits are a set lookup; substring scan only on a miss)
         if len(expected_files) > 0:
-            retrieved = sum(1 for exp in expected_files if any(exp in f for f in retrieved_files))
+            retrieved_set = set(retrieved_files)
+            retrieved = sum(
+                1 for exp in expected_files
+                if exp in retrieved_set or any(exp in f for f in retrieved_files)
+            )
             metrics["recall_at_k"] = retrieved / len(expected_files)
         else:
             metrics["recall_at_k"] = 1.0
@@ -257,24 +435,47 @@ class APIEvaluator:
 
         return metrics
 
-    def run_single_test(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
-        """Run a single test case"""
-        print(f"\n{'='*70}")
-        print(f"Test: {test_case['id']} - {test_case['category']}")
-        print(f"Q: {test_case['question']}")
-        print(f"{'='*70}")
+    def run_single_test(self, test_case: Dict[str, Any],
+                        prefetched: Optional[Tuple[Dict[str, Any], float]] = None,
+                        batch: bool = False) -> Dict[str, Any]:
+        """
+        Run a single test case
 
+        Output is buffered and printed in one block so concurrent tests don't interleave.
+
+        Args:
+            test_case: Test case to run
+            prefetched: (API response or the exception raised fetching it, query time)
+                already fetched elsewhere; when given, no request is made
+            batch: The query time is a share of a /query_batch round trip rather
+                than this question's latency; it is recorded as batch_query_time
+                and kept out of the query-time metrics
+        """
+        time_field = "batch_query_time" if batch else "query_time"
+        log = []
+        log.append(f"\n{'='*70}")
+        log.append(f"Test: {test_case['id']} - {test_case['category']}")
+        log.append(f"Q: {test_case['question']}")
+        log.append(f"{'='*70}")
+
+        if prefetched is None:
+            self.rate_limiter.wait()
         start_time = time.time()
 
         try:
-            # Query API
-            result = self.query_api(
-                question=test_case["question"],
-                user_role=test_case["user_role"],
-                include_sources=True
-            )
+            if prefetched is None:
+                # Query API
+                result = self.query_api(
+                    question=test_case["question"],
+                    user_role=test_case["user_role"],
+                    include_sources=True
+                )
 
-            query_time = time.time() - start_time
+                query_time = time.time() - start_time
+            else:
+                result, query_time = prefetched
+                if isinstance(result, Exception):
+                    raise result
 
             # Evaluate
             quality_metrics = self.evaluate_answer_quality(
@@ -307,37 +508,71 @@ class APIEvaluator:
                 "difficulty": test_case["difficulty"],
                 "question": test_case["question"],
                 "answer": result["answer"],
-                "query_time": round(query_time, 3),
+                time_field: round(query_time, 3),
                 "passed": passed,
                 **quality_metrics,
                 **retrieval_metrics
             }
 
             # Print summary
-            print(f"✓ Keyword Coverage: {quality_metrics['keyword_coverage']:.2%}")
-            print(f"✓ Query Time: {query_time:.3f}s")
-            print(f"✓ Sources Retrieved: {len(result.get('sources', []))}")
-            print(f"{'✅ TEST PASSED' if passed else '❌ TEST FAILED'}")
+            log.append(f"✓ Keyword Coverage: {quality_metrics['keyword_coverage']:.2%}")
+            if batch:
+                log.append(f"✓ Batch Query Time (share of round trip): {query_time:.3f}s")
+            else:
+                log.append(f"✓ Query Time: {query_time:.3f}s")
+            log.append(f"✓ Sources Retrieved: {len(result.get('sources', []))}")
+            log.append(f"{'✅ TEST PASSED' if passed else '❌ TEST FAILED'}")
 
             if not passed:
                 if quality_metrics["keyword_coverage"] < keyword_threshold:
-                    print(f"   - Low keyword coverage: {quality_metrics['keyword_coverage']:.2%}")
-                    print(f"   - Missing: {quality_metrics['missing_keywords']}")
+                    log.append(f"   - Low keyword coverage: {quality_metrics['keyword_coverage']:.2%}")
+                    log.append(f"   - Missing: {quality_metrics['missing_keywords']}")
                 if retrieval_metrics["recall_at_k"] < retrieval_threshold:
-                    print(f"   - Low recall: {retrieval_metrics['recall_at_k']:.2%}")
+                    log.append(f"   - Low recall: {retrieval_metrics['recall_at_k']:.2%}")
 
         except Exception as e:
-            print(f"❌ Error: {str(e)}")
+            log.append(f"❌ Error: {str(e)}")
             test_result = {
                 "test_id": test_case["id"],
                 "category": test_case["category"],
                 "question": test_case["question"],
                 "error": str(e),
                 "passed": False,
-                "query_time": time.time() - start_time
+                time_field: prefetched[1] if prefetched else time.time() - start_time
             }
 
-        return test_result
+        print("\n".join(log))
+        return self._stream_result(test_result)
+
+    def _stream_result(self, test_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append a full test result to the NDJSON stream and return its in-memory summary
+
+        The answer text (the bulk of each result) is kept only on disk, so memory
+        stays flat as the test set grows and completed tests survive a crash.
+
+        Args:
+            test_result: Complete result of one test
+
+        Returns:
+            The result without its answer text
+        """
+        line = orjson.dumps(test_result) + b"\n"
+        with self._stream_lock:
+            if self._stream is None:
+                self.stream_path.parent.mkdir(parents=True, exist_ok=True)
+                self._stream = open(self.stream_path, "wb")
+                self.results["metadata"]["individual_results_path"] = str(self.stream_path)
+            self._stream.write(line)
+            self._stream.flush()
+        return {k: v for k, v in test_result.items() if k != "answer"}
+
+    def _close_stream(self) -> None:
+        """Close the NDJSON result stream"""
+        with self._stream_lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
 
     def run_all_tests(self) -> Dict[str, Any]:
         """Run all test cases"""
@@ -347,25 +582,109 @@ class APIEvaluator:
         print("API-BASED RAG EVALUATION")
         print(f"{'='*70}")
         print(f"Base URL: {self.base_url}")
-        print(f"Rate Limit: {self.request_delay}s between requests")
+        print(f"Rate Limit: {self.request_delay}s between request starts")
+        print(f"Concurrency: {self.concurrency}")
         print(f"Total Tests: {len(test_cases)}\n")
 
-        for i, test_case in enumerate(test_cases, 1):
-            print(f"\nProgress: {i}/{len(test_cases)}")
-
-            result = self.run_single_test(test_case)
-            self.results["individual_results"].append(result)
+        try:
+            results = self._run_batch(test_cases) if self.batch else None
+            if results is None:
+                results = self._run_concurrent(test_cases)
+        finally:
+            self._close_stream()
 
-            # Rate limiting
-            if i < len(test_cases):
-                print(f"⏳ Waiting {self.request_delay}s...")
-                time.sleep(self.request_delay)
+        # Summaries only; full results (with answers) are in the NDJSON stream
+        self.results["individual_results"].extend(results)
 
         # Calculate aggregates
         self._calculate_aggregates()
 
         return self.results
 
+    def _run_concurrent(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run tests as individual /query requests, overlapped on one event loop"""
+        return asyncio.run(self._run_concurrent_async(test_cases))
+
+    async def _run_concurrent_async(self, test_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Issue up to `concurrency` /query requests at once over one async client
+
+        The rate limiter spaces request starts; results keep test-case order.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency
+        )
+        results: List[Dict[str, Any]] = [None] * len(test_cases)
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=30, limits=limits) as client:
+            async def run_indexed(i: int, test_case: Dict[str, Any]):
+                return i, await self._run_single_async(client, semaphore, test_case)
+
+            tasks = [run_indexed(i, test_case) for i, test_case in enumerate(test_cases)]
+            for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                i, result = await next_result
+                results[i] = result
+                print(f"\nProgress: {done}/{len(test_cases)}")
+        return results
+
+    async def _run_single_async(self, client: "httpx.AsyncClient", semaphore: asyncio.Semaphore,
+                                test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one test's answer asynchronously, then score it via run_single_test"""
+        payload = {
+            "question": test_case["question"],
+            "user_role": test_case["user_role"],
+            "include_sources": True
+        }
+
+        async with semaphore:
+            await self.rate_limiter.wait_async()
+            start_time = time.time()
+            try:
+                response = await client.post("/query", json=payload)
+                response.raise_for_status()
+                result = orjson.loads(response.content)
+            except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+                result = e
+            query_time = time.time() - start_time
+
+        return self.run_single_test(test_case, prefetched=(result, query_time))
+
+    def _run_batch(self, test_cases: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run all tests through one /query_batch request
+
+        Returns:
+            Test results, or None if the server has no batch endpoint
+        """
+        self.rate_limiter.wait()
+        start_time = time.time()
+        try:
+            responses = self.query_batch_api(test_cases)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError, KeyError) as e:
+            print(f"❌ Batch request failed: {e!r}")
+            responses = [e] * len(test_cases)
+
+        if responses is None:
+            print("⚠️  /query_batch not available; falling back to individual queries")
+            return None
+        if len(responses) != len(test_cases):
+            # A short (or long) results list can't be matched to test cases reliably
+            print(f"⚠️  /query_batch returned {len(responses)} results for {len(test_cases)} "
+                  "questions; falling back to individual queries")
+            return None
+
+        # Each test is charged an equal share of the batch round-trip
+        query_time = (time.time() - start_time) / len(test_cases)
+        self.results["metadata"]["batch"] = True
+
+        results = []
+        for i, (test_case, response) in enumerate(zip(test_cases, responses), 1):
+            results.append(self.run_single_test(test_case, prefetched=(response, query_time), batch=True))
+            print(f"\nProgress: {i}/{len(test_cases)}")
+        return results
+
     def _calculate_aggregates(self):
         """Calculate aggregate metrics"""
         results = self.results["individual_results"]
@@ -374,35 +693,57 @@ class APIEvaluator:
         if not valid:
             return
 
+        # One pass accumulates every sum and the query-time range
+        n = len(valid)
+        passed = 0
+        keyword_sum = length_sum = precision_sum = recall_sum = f1_sum = time_sum = batch_time_sum = 0.0
+        timed = batched = 0
+        time_min = float("inf")
+        time_max = float("-inf")
+        for r in valid:
+            passed += bool(r.get("passed"))
+            keyword_sum += r.get("keyword_coverage", 0)
+            length_sum += r.get("answer_length_words", 0)
+            precision_sum += r.get("precision_at_k", 0)
+            recall_sum += r.get("recall_at_k", 0)
+            f1_sum += r.get("f1_score", 0)
+            # Batch shares of a round trip aren't per-query latencies, so they
+            # are averaged separately from query_time
+            if "batch_query_time" in r:
+                batch_time_sum += r["batch_query_time"]
+                batched += 1
+                continue
+            query_time = r.get("query_time", 0)
+            timed += 1
+            time_sum += query_time
+            if query_time < time_min:
+                time_min = query_time
+            if query_time > time_max:
+                time_max = query_time
+
+        metrics = self.results["metrics"]
+
         # Overall metrics
-        self.results["metrics"]["total_tests"] = len(results)
-        self.results["metrics"]["passed_tests"] = sum(1 for r in valid if r.get("passed"))
-        self.results["metrics"]["pass_rate"] = self.results["metrics"]["passed_tests"] / len(valid)
+        metrics["total_tests"] = len(results)
+        metrics["passed_tests"] = passed
+        metrics["pass_rate"] = passed / n
 
         # Quality
-        self.results["metrics"]["avg_keyword_coverage"] = statistics.mean(
-            r.get("keyword_coverage", 0) for r in valid
-        )
-        self.results["metrics"]["avg_answer_length"] = statistics.mean(
-            r.get("answer_length_words", 0) for r in valid
-        )
+        metrics["avg_keyword_coverage"] = keyword_sum / n
+        metrics["avg_answer_length"] = length_sum / n
 
         # Retrieval
-        self.results["metrics"]["avg_precision_at_k"] = statistics.mean(
-            r.get("precision_at_k", 0) for r in valid
-        )
-        self.results["metrics"]["avg_recall_at_k"] = statistics.mean(
-            r.get("recall_at_k", 0) for r in valid
-        )
-        self.results["metrics"]["avg_f1_score"] = statistics.mean(
-            r.get("f1_score", 0) for r in valid
-        )
+        metrics["avg_precision_at_k"] = precision_sum / n
+        metrics["avg_recall_at_k"] = recall_sum / n
+        metrics["avg_f1_score"] = f1_sum / n
 
         # Performance
-        query_times = [r.get("query_time", 0) for r in valid]
-        self.results["metrics"]["avg_query_time"] = statistics.mean(query_times)
-        self.results["metrics"]["min_query_time"] = min(query_times)
-        self.results["metrics"]["max_query_time"] = max(query_times)
+        if timed:
+            metrics["avg_query_time"] = time_sum / timed
+            metrics["min_query_time"] = time_min
+            metrics["max_query_time"] = time_max
+        if batched:
+            metrics["avg_batch_query_time"] = batch_time_sum / batched
 
     def print_summary(self):
         """Print evaluation summary"""
@@ -424,23 +765,32 @@ class APIEvaluator:
         print(f"   Avg F1 Score: {metrics.get('avg_f1_score', 0):.3f}")
 
         print(f"\n⚡ Performance:")
-        print(f"   Avg Query Time: {metrics.get('avg_query_time', 0):.3f}s")
-        print(f"   Min Query Time: {metrics.get('min_query_time', 0):.3f}s")
-        print(f"   Max Query Time: {metrics.get('max_query_time', 0):.3f}s")
+        if "avg_query_time" in metrics:
+            print(f"   Avg Query Time: {metrics['avg_query_time']:.3f}s")
+            print(f"   Min Query Time: {metrics['min_query_time']:.3f}s")
+            print(f"   Max Query Time: {metrics['max_query_time']:.3f}s")
+        if "avg_batch_query_time" in metrics:
+            print(f"   Avg Batch Query Time (share of round trip): {metrics['avg_batch_query_time']:.3f}s")
 
         print(f"\n{'='*70}")
 
     def save_results(self, filename: str = None):
-        """Save results to JSON"""
+        """
+        Save metadata, aggregate metrics and per-test summaries to JSON
+
+        Full per-test results, including answers, were already streamed to
+        the NDJSON file named in metadata["individual_results_path"].
+        """
+        self._close_stream()
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"api_evaluation_results_{timestamp}.json"
+            filename = self.stream_path.with_suffix(".json").name
 
         output_path = Path("results") / filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        output_path.write_bytes(
+            orjson.dumps(self.results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
 
         print(f"\n✅ Results saved: {output_path}")
         return str(output_path)
@@ -452,7 +802,11 @@ def main():
     parser.add_argument("--base-url", default="http://localhost:8000",
                        help="Base URL of the API")
     parser.add_argument("--delay", type=float, default=2.0,
-                       help="Delay between requests (seconds)")
+                       help="Minimum interval between request starts (seconds)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                       help="Maximum concurrent requests")
+    parser.add_argument("--batch", action="store_true",
+                       help="Send all questions in one /query_batch request")
     args = parser.parse_args()
 
     print("""
@@ -464,7 +818,12 @@ def main():
     """)
 
     # Initialize evaluator
-    evaluator = APIEvaluator(base_url=args.base_url, request_delay=args.delay)
+    evaluator = APIEvaluator(
+        base_url=args.base_url,
+        request_delay=args.delay,
+        concurrency=args.concurrency,
+        batch=args.batch
+    )
 
     # Check API health
     print(f"\n🔍 Checking API health at {args.base_url}...")
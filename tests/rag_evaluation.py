@@ -18,22 +18,322 @@ IMPROVEMENTS:
 - Document existence checks before evaluation
 """
 
+import io
+import re
+import argparse
 import time
-import json
-import statistics
-from typing import List, Dict, Any, Tuple
+import pickle
+import asyncio
+import orjson
+import numpy as np
+import threading
+from typing import Iterator, List, Dict, Any, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is optional; matching falls back to compiled regexes
+    ahocorasick = None
+
 # Import backend components
 import sys
 sys.path.append('..')
 
-from backend.rag_engine import rag_engine
-from backend.document_processor import document_processor
 from backend.config import settings
 from backend.models import UserRole
 
+# The engine and document processor connect to the vector DB and LLM when
+# imported, so they are loaded on first use rather than with this module
+_rag_engine = None
+_document_processor = None
+
+
+def _get_engine():
+    """Get the shared RAG engine, importing it on first use"""
+    global _rag_engine
+    if _rag_engine is None:
+        from backend.rag_engine import get_rag_engine
+        _rag_engine = get_rag_engine()
+    return _rag_engine
+
+
+def _get_docproc():
+    """Get the shared document processor, importing it on first use"""
+    global _document_processor
+    if _document_processor is None:
+        from backend.document_processor import document_processor
+        _document_processor = document_processor
+    return _document_processor
+
+
+# Column layout of the per-test table used for aggregate metrics; the float
+# fields match RAGEvaluator.AVERAGED_FIELDS, in order
+_METRIC_DTYPE = np.dtype([
+    ("keyword_coverage", "f8"),
+    ("answer_length_words", "f8"),
+    ("precision_at_k", "f8"),
+    ("recall_at_k", "f8"),
+    ("f1_score", "f8"),
+    ("mrr", "f8"),
+    ("query_time", "f8"),
+    ("passed", "?"),
+    ("category", "U32")
+])
+
+
+# Phrases that mark an answer as a refusal, matched against the lowercased answer
+_REFUSAL_INDICATORS = (
+    "don't have", "cannot", "can't", "unable to",
+    "don't provide", "not able to", "consult",
+    "medical professional", "healthcare professional"
+)
+
+
+def _build_automaton(words) -> "ahocorasick.Automaton":
+    """
+    Build an Aho-Corasick automaton reporting every occurrence of the given words
+
+    Args:
+        words: Lowercased words; each match yields the word itself
+
+    Returns:
+        Automaton to run over lowercased text with iter()
+    """
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_REFUSAL_RE = re.compile("|".join(map(re.escape, _REFUSAL_INDICATORS)))
+_REFUSAL_AC = _build_automaton(_REFUSAL_INDICATORS) if ahocorasick is not None else None
+
+
+def _is_refusal(answer_lower: str) -> bool:
+    """Check whether a lowercased answer contains any refusal phrase"""
+    if _REFUSAL_AC is not None:
+        return next(_REFUSAL_AC.iter(answer_lower), None) is not None
+    return _REFUSAL_RE.search(answer_lower) is not None
+
+
+def _compile_keyword_regex(keywords: List[str]) -> "re.Pattern":
+    """
+    Compile one pattern that finds all of a test case's keywords in a single pass
+
+    The alternation sits inside a lookahead, so overlapping keywords (e.g. "$45"
+    and "45") are each reported. Longer keywords are tried first at each position.
+
+    Args:
+        keywords: Lowercased expected keywords
+
+    Returns:
+        Pattern whose findall() yields the keyword matched at each position
+    """
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+
+
+def _basename_set(filenames: List[str]) -> Set[str]:
+    """Lowercased basenames of expected source files"""
+    return {Path(f).name.lower() for f in filenames}
+
+
+def _keyword_pairs(keywords: List[str]) -> Tuple[Tuple[str, str], ...]:
+    """(keyword, lowercased keyword) pairs, so matching never re-lowers a keyword"""
+    return tuple((kw, kw.lower()) for kw in keywords)
+
+
+def _prepare_test_case(test_case: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompile a test case's keyword matchers and expected-file set (stored under underscore keys)"""
+    keyword_pairs = _keyword_pairs(test_case.get("expected_answer_contains", []))
+    test_case["_keyword_pairs"] = keyword_pairs
+    test_case["_keyword_regex"] = (
+        _compile_keyword_regex([lower for _, lower in keyword_pairs]) if keyword_pairs else None
+    )
+    test_case["_keyword_automaton"] = (
+        _build_automaton({lower for _, lower in keyword_pairs})
+        if keyword_pairs and ahocorasick is not None else None
+    )
+    test_case["_expected_set"] = _basename_set(test_case.get("expected_source_files", []))
+    return test_case
+
+
+# Evaluation test cases from test_cases.json (shared; loaded and prepared once at import)
+_TEST_CASES = tuple(
+    _prepare_test_case(test_case)
+    for test_case in orjson.loads(Path(__file__).with_name("test_cases.json").read_bytes())
+)
+
+
+# Serializes report writes from concurrent tests
+_print_lock = threading.Lock()
+
+
+def _emit(buf: io.StringIO) -> None:
+    """Write a buffered report to stdout in a single call"""
+    with _print_lock:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+def load_run(path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the individual results of a run from its JSON Lines file
+
+    Args:
+        path: Path to a results/run_*.jsonl file
+
+    Yields:
+        One test result dictionary per line
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+class EngineQueryError(RuntimeError):
+    """A failure the RAG engine reported in its result instead of raising"""
+
+    def __init__(self, result: Dict[str, Any]):
+        """
+        Args:
+            result: Engine result carrying "error" (and "error_type")
+        """
+        super().__init__(result["error"])
+        # Class name of the exception the engine caught
+        self.error_type = result.get("error_type", "RuntimeError")
+
+
+class SemanticCache:
+    """
+    In-memory cache of answers keyed by question embedding
+
+    A lookup returns the stored result of the most similar earlier question
+    asked with the same role, if its cosine similarity exceeds the threshold.
+    """
+
+    def __init__(self, threshold: float = 0.97):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.threshold = threshold
+        # Per role: unit-normalized question vectors and their results
+        self._vectors: Dict[str, List[np.ndarray]] = {}
+        self._values: Dict[str, List[Dict[str, Any]]] = {}
+        self.hits = 0
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Unit-length copy of a vector, so dot products are cosine similarities"""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def get(self, vector: List[float], user_role: str) -> Dict[str, Any]:
+        """
+        Look up the result of a near-identical earlier question
+
+        Args:
+            vector: Question embedding
+            user_role: Role the question is asked with
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        vectors = self._vectors.get(user_role)
+        if not vectors:
+            return None
+        similarities = np.stack(vectors) @ self._normalize(vector)
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        self.hits += 1
+        return self._values[user_role][best]
+
+    def put(self, vector: List[float], user_role: str, result: Dict[str, Any]) -> None:
+        """
+        Store a question's result
+
+        Args:
+            vector: Question embedding
+            user_role: Role the question was asked with
+            result: Engine result to return for similar questions
+        """
+        self._vectors.setdefault(user_role, []).append(self._normalize(vector))
+        self._values.setdefault(user_role, []).append(result)
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket rate limiter for evaluator requests
+
+    Tokens refill at `rate` per second up to `capacity`. A rate-limit or
+    server error halves the rate and pauses all requests for an exponential
+    backoff; each success ramps the rate linearly back toward the ceiling.
+    """
+
+    # Fraction of the ceiling restored per successful request
+    RAMP_STEP = 0.1
+    # Longest pause after repeated rate-limit errors (seconds)
+    MAX_BACKOFF = 60
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: Maximum sustained requests per second
+            capacity: Maximum burst size
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._penalties = 0
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self) -> float:
+        """
+        Back off after a rate-limit or server error
+
+        Returns:
+            Seconds all requests are paused for
+        """
+        self._penalties += 1
+        self.rate = max(self.max_rate * self.RAMP_STEP, self.rate / 2)
+        backoff = min(self.MAX_BACKOFF, 2 ** self._penalties)
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + backoff)
+        return backoff
+
+    def reward(self) -> None:
+        """Ramp the rate back toward the ceiling after a success"""
+        self._penalties = 0
+        self.rate = min(self.max_rate, self.rate + self.max_rate * self.RAMP_STEP)
+
 
 class RAGEvaluator:
     """
@@ -41,11 +341,71 @@ class RAGEvaluator:
     """
 
     # Rate limiting configuration
-    REQUEST_DELAY = 2.0  # Seconds to wait between API calls (adjustable)
+    MAX_REQUEST_RATE = 4.0  # Requests per second ceiling (adjustable)
+
+    # Per-test result fields averaged into metrics (field -> metric name);
+    # order matches the leading columns of _METRIC_DTYPE
+    AVERAGED_FIELDS = {
+        "keyword_coverage": "avg_keyword_coverage",
+        "answer_length_words": "avg_answer_length",
+        "precision_at_k": "avg_precision_at_k",
+        "recall_at_k": "avg_recall_at_k",
+        "f1_score": "avg_f1_score",
+        "mrr": "avg_mrr",
+        "query_time": "avg_query_time"
+    }
+
+    # Query-time percentiles reported in metrics (as pNN_query_time)
+    QUERY_TIME_PERCENTILES = (50, 90, 95, 99)
+
+    # Question embeddings persisted between runs (Phase 1 -> Phase 2)
+    EMBED_CACHE_FILE = "embed_cache.pkl"
+
+    # Exception types and message fragments that indicate provider throttling or a
+    # server-side failure (specific phrases: a bare "rate" also matches "GenerateContent")
+    RATE_LIMIT_ERRORS = frozenset({
+        "RateLimitError", "ResourceExhausted", "ServiceUnavailable", "InternalServerError"
+    })
+    RATE_LIMIT_MARKERS = (
+        "rate limit", "ratelimit", "rate_limit", "429", "quota", "resource exhausted",
+        "server error", "503", "unavailable"
+    )
+
+    # Seconds allowed for the untimed warm-up query
+    WARMUP_TIMEOUT = 10.0
+
+    # Retry configuration: transient provider/network errors are retried in place
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 2.0  # Seconds before the first retry; grows 1.5x per attempt
+    RETRYABLE_ERRORS = frozenset({
+        "RateLimitError", "APIConnectionError", "APITimeoutError", "APIError",
+        "Timeout", "TimeoutError", "ResourceExhausted", "ServiceUnavailable",
+        "InternalServerError"
+    })
+
+    def __init__(self, max_workers: int = 8, batch: bool = True, use_semantic_cache: bool = False):
+        """
+        Initialize evaluator with test cases
 
-    def __init__(self):
-        """Initialize evaluator with test cases"""
+        Args:
+            max_workers: Maximum test cases in flight at once (per-test mode)
+            batch: Answer all test cases with one rag_engine.batch_query call
+            use_semantic_cache: Reuse answers of near-identical questions (per-test mode;
+                leave off for baseline measurements)
+        """
+        self.max_workers = max(1, max_workers)
+        self.batch = batch
+        self.semantic_cache = SemanticCache() if use_semantic_cache else None
+        self.bucket = TokenBucket(self.MAX_REQUEST_RATE, self.max_workers)
         self.test_cases = self._load_test_cases()
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Output directory, created once per evaluator
+        self._results_dir = Path("results")
+        self._results_dir.mkdir(parents=True, exist_ok=True)
+        self.embed_cache_path = self._results_dir / self.EMBED_CACHE_FILE
+        # Individual results are appended here as each test finishes (see load_run)
+        self.run_path = self._results_dir / f"run_{self.timestamp}.jsonl"
+        self._jsonl = None
         self.results = {
             "metadata": {
                 "timestamp": datetime.now().isoformat(),
@@ -56,7 +416,10 @@ class RAGEvaluator:
                 "llm_max_tokens": settings.LLM_MAX_TOKENS,
                 "embedding_model": settings.EMBEDDING_MODEL,
                 "chat_model": settings.CHAT_MODEL,
-                "request_delay": self.REQUEST_DELAY
+                "max_request_rate": self.MAX_REQUEST_RATE,
+                "max_workers": self.max_workers,
+                "batch": batch,
+                "semantic_cache": use_semantic_cache
             },
             "metrics": {},
             "individual_results": []
@@ -65,9 +428,12 @@ class RAGEvaluator:
         # Check if documents are ingested
         self._verify_setup()
 
+        # Pay cold-start costs before any timed test
+        self._warmup()
+
     def _verify_setup(self):
         """Verify that the vector database has documents"""
-        doc_count = document_processor.get_document_count()
+        doc_count = _get_docproc().get_document_count()
         print(f"\n{'='*70}")
         print(f"SETUP VERIFICATION")
         print(f"{'='*70}")
@@ -85,6 +451,30 @@ class RAGEvaluator:
 
         print(f"{'='*70}\n")
 
+    def _warmup(self):
+        """
+        Issue one untimed query so cold-start costs don't skew query-time metrics
+
+        The first query pays for opening the vector index and initializing
+        clients; its latency is recorded separately as warmup_time_seconds.
+        """
+        start_time = time.time()
+        try:
+            asyncio.run(asyncio.wait_for(
+                _get_engine().query(
+                    question="warmup",
+                    user_role=UserRole.GENERAL,
+                    include_sources=False
+                ),
+                timeout=self.WARMUP_TIMEOUT
+            ))
+        except Exception as e:
+            print(f"⚠️  Warm-up query failed ({type(e).__name__}); continuing without it")
+        warmup_time = time.time() - start_time
+
+        self.results["metadata"]["warmup_time_seconds"] = round(warmup_time, 3)
+        print(f"🔥 Warm-up query took {warmup_time:.3f}s (excluded from metrics)\n")
+
     def _load_test_cases(self) -> List[Dict[str, Any]]:
         """
         Load comprehensive test cases covering various scenarios
@@ -92,168 +482,7 @@ class RAGEvaluator:
         Returns:
             List of test case dictionaries
         """
-        return [
-            # === FACTUAL RECALL TESTS ===
-            {
-                "id": "TC001",
-                "category": "factual_recall",
-                "difficulty": "easy",
-                "question": "What are the visiting hours for ICU patients?",
-                "user_role": "general",
-                "expected_answer_contains": ["10:00 AM", "12:00 PM", "4:00 PM", "6:00 PM"],
-                "expected_source_files": ["visiting_hours.txt"],
-                "ground_truth": "ICU visiting hours are 10:00 AM - 12:00 PM and 4:00 PM - 6:00 PM"
-            },
-            {
-                "id": "TC002",
-                "category": "factual_recall",
-                "difficulty": "easy",
-                "question": "What documents are required for hospital admission?",
-                "user_role": "receptionist",
-                "expected_answer_contains": ["photo ID", "insurance card", "emergency contact"],
-                "expected_source_files": ["admission_policy.txt"],
-                "ground_truth": "Valid government-issued photo identification, Insurance card or proof of financial arrangement, Emergency contact information"
-            },
-            {
-                "id": "TC003",
-                "category": "factual_recall",
-                "difficulty": "medium",
-                "question": "How much does a CT scan of the chest cost?",
-                "user_role": "billing",
-                "expected_answer_contains": ["900", "1400", "contrast"],
-                "expected_source_files": ["diagnostics_pricing_guide.txt"],
-                "ground_truth": "CT Chest without contrast costs $900, with contrast costs $1,400"
-            },
-            # === MULTI-HOP REASONING TESTS ===
-            {
-                "id": "TC004",
-                "category": "multi_hop",
-                "difficulty": "hard",
-                "question": "If I need to schedule a dental appointment and want to know the costs, what should I do and what can I expect to pay for a routine cleaning?",
-                "user_role": "general",
-                "expected_answer_contains": ["call", "(555) 123-4600", "online", "$100", "$150"],
-                "expected_source_files": ["dental_clinic_faq.txt"],
-                "ground_truth": "Schedule by calling (555) 123-4600 or online at www.hospital.org/dental. Routine cleaning costs $100-$150"
-            },
-            {
-                "id": "TC005",
-                "category": "multi_hop",
-                "difficulty": "hard",
-                "question": "What financial assistance is available for uninsured patients and how do I apply?",
-                "user_role": "billing",
-                "expected_answer_contains": ["charity care", "income", "application", "30%"],
-                "expected_source_files": ["billing_and_insurance.txt"],
-                "ground_truth": "Charity Care Program available based on income. Self-pay discount of 30%. Apply at Admissions with income documentation"
-            },
-            # === COMPARISON/ANALYSIS TESTS ===
-            {
-                "id": "TC006",
-                "category": "comparison",
-                "difficulty": "medium",
-                "question": "What's the difference between visiting hours for ICU and regular medical-surgical units?",
-                "user_role": "general",
-                "expected_answer_contains": ["ICU", "medical-surgical", "8:00", "10:00"],
-                "expected_source_files": ["visiting_hours.txt"],
-                "ground_truth": "ICU: 10 AM-12 PM and 4-6 PM. Medical-Surgical: 8 AM - 8 PM daily"
-            },
-            # === POLICY/PROCEDURE TESTS ===
-            {
-                "id": "TC007",
-                "category": "policy",
-                "difficulty": "medium",
-                "question": "What is the hospital's cancellation policy for dental appointments?",
-                "user_role": "receptionist",
-                "expected_answer_contains": ["24", "hour", "$50", "fee"],
-                "expected_source_files": ["dental_clinic_faq.txt"],
-                "ground_truth": "24-hour notice required. Late cancellations or no-shows may result in $50 fee"
-            },
-            {
-                "id": "TC008",
-                "category": "policy",
-                "difficulty": "medium",
-                "question": "Can visitors bring outside food for patients?",
-                "user_role": "general",
-                "expected_answer_contains": ["allowed", "unless restricted", "dietary"],
-                "expected_source_files": ["visiting_hours.txt"],
-                "ground_truth": "Outside food allowed for patients unless medically restricted"
-            },
-            # === NUMERICAL/PRICING TESTS ===
-            {
-                "id": "TC009",
-                "category": "numerical",
-                "difficulty": "easy",
-                "question": "How much does a complete blood count (CBC) test cost?",
-                "user_role": "billing",
-                "expected_answer_contains": ["$45", "45"],
-                "expected_source_files": ["diagnostics_pricing_guide.txt"],
-                "ground_truth": "$45"
-            },
-            {
-                "id": "TC010",
-                "category": "numerical",
-                "difficulty": "medium",
-                "question": "What's the price range for dental braces?",
-                "user_role": "general",
-                "expected_answer_contains": ["$4,000", "$7,000", "payment plans"],
-                "expected_source_files": ["dental_clinic_faq.txt"],
-                "ground_truth": "Traditional braces: $4,000-$7,000 with payment plans available"
-            },
-            # === EDGE CASES ===
-            {
-                "id": "TC011",
-                "category": "edge_case",
-                "difficulty": "hard",
-                "question": "What should I do if my insurance claim is denied?",
-                "user_role": "billing",
-                "expected_answer_contains": ["appeal", "documentation", "30 days"],
-                "expected_source_files": ["billing_and_insurance.txt"],
-                "ground_truth": "Hospital will file initial appeal. Contact Patient Financial Services within 60 days with documentation"
-            },
-            {
-                "id": "TC012",
-                "category": "edge_case",
-                "difficulty": "hard",
-                "question": "Are there any restrictions on who can visit pediatric patients?",
-                "user_role": "receptionist",
-                "expected_answer_contains": ["parents", "24-hour", "siblings", "healthy"],
-                "expected_source_files": ["visiting_hours.txt"],
-                "ground_truth": "Parents/Guardians: 24-hour access. Siblings must be healthy (no symptoms)"
-            },
-            # === AMBIGUOUS/CLARIFICATION TESTS ===
-            {
-                "id": "TC013",
-                "category": "ambiguous",
-                "difficulty": "medium",
-                "question": "How do I get my medical records?",
-                "user_role": "general",
-                "expected_answer_contains": ["Medical Records", "(555)", "first copy", "free"],
-                "expected_source_files": ["billing_and_insurance.txt"],
-                "ground_truth": "Request from Medical Records: (555) 123-4580. First copy free, additional copies $25"
-            },
-            # === OUT-OF-SCOPE TESTS (Should decline gracefully) ===
-            {
-                "id": "TC014",
-                "category": "out_of_scope",
-                "difficulty": "hard",
-                "question": "What medication should I take for my headache?",
-                "user_role": "general",
-                "expected_answer_contains": ["don't have", "medical advice", "consult", "healthcare professional"],
-                "expected_source_files": [],
-                "ground_truth": "Should decline to provide medical advice",
-                "expect_refusal": True
-            },
-            {
-                "id": "TC015",
-                "category": "out_of_scope",
-                "difficulty": "hard",
-                "question": "Can you diagnose my symptoms?",
-                "user_role": "doctor",
-                "expected_answer_contains": ["cannot", "diagnosis", "medical professional"],
-                "expected_source_files": [],
-                "ground_truth": "Should decline to provide diagnosis",
-                "expect_refusal": True
-            }
-        ]
+        return list(_TEST_CASES)
 
 
     def evaluate_answer_quality(
@@ -275,14 +504,37 @@ class RAGEvaluator:
         """
         metrics = {}
 
+        answer_lower = answer.lower()
+
         # 1. Keyword Coverage Score
         expected_keywords = test_case.get("expected_answer_contains", [])
         if expected_keywords:
-            answer_lower = answer.lower()
-            matched_keywords = [kw for kw in expected_keywords if kw.lower() in answer_lower]
+            keyword_pairs = test_case.get("_keyword_pairs") or _keyword_pairs(expected_keywords)
+            automaton = test_case.get("_keyword_automaton")
+            if automaton is not None:
+                # Aho-Corasick reports every occurrence, overlapping ones included
+                present = {kw_lower for _, kw_lower in automaton.iter(answer_lower)}
+            else:
+                keyword_regex = test_case.get("_keyword_regex")
+                if keyword_regex is None:
+                    keyword_regex = _compile_keyword_regex([lower for _, lower in keyword_pairs])
+                # Only the longest keyword is reported at each position, so a keyword is
+                # present if it is a prefix of some match
+                found = set(keyword_regex.findall(answer_lower))
+                present = {
+                    kw_lower for _, kw_lower in keyword_pairs
+                    if kw_lower in found or any(m.startswith(kw_lower) for m in found)
+                }
+            matched_keywords = []
+            missing_keywords = []
+            for kw, kw_lower in keyword_pairs:
+                if kw_lower in present:
+                    matched_keywords.append(kw)
+                else:
+                    missing_keywords.append(kw)
             metrics["keyword_coverage"] = len(matched_keywords) / len(expected_keywords)
             metrics["matched_keywords"] = matched_keywords
-            metrics["missing_keywords"] = [kw for kw in expected_keywords if kw not in matched_keywords]
+            metrics["missing_keywords"] = missing_keywords
         else:
             metrics["keyword_coverage"] = 1.0
             metrics["matched_keywords"] = []
@@ -296,13 +548,7 @@ class RAGEvaluator:
         metrics["sources_count"] = len(sources)
 
         # 4. Refusal Detection (for out-of-scope questions)
-        refusal_indicators = [
-            "don't have", "cannot", "can't", "unable to",
-            "don't provide", "not able to", "consult",
-            "medical professional", "healthcare professional"
-        ]
-        answer_lower = answer.lower()
-        metrics["is_refusal"] = any(indicator in answer_lower for indicator in refusal_indicators)
+        metrics["is_refusal"] = _is_refusal(answer_lower)
         metrics["expected_refusal"] = test_case.get("expect_refusal", False)
 
         return metrics
@@ -327,17 +573,22 @@ class RAGEvaluator:
         expected_files = test_case.get("expected_source_files", [])
         retrieved_files = [s["filename"] for s in sources]
 
+        # A retrieved chunk is relevant if its file's basename is an expected file
+        expected_set = test_case.get("_expected_set")
+        if expected_set is None:
+            expected_set = _basename_set(expected_files)
+        retrieved_basenames = [Path(f).name.lower() for f in retrieved_files]
+        relevant_mask = [b in expected_set for b in retrieved_basenames]
+
         # Precision@K: What fraction of retrieved docs are relevant?
-        if len(retrieved_files) > 0:
-            relevant_retrieved = sum(1 for f in retrieved_files if any(exp in f for exp in expected_files))
-            metrics["precision_at_k"] = relevant_retrieved / len(retrieved_files)
+        if relevant_mask:
+            metrics["precision_at_k"] = sum(relevant_mask) / len(relevant_mask)
         else:
             metrics["precision_at_k"] = 0.0
 
         # Recall@K: What fraction of relevant docs were retrieved?
-        if len(expected_files) > 0:
-            retrieved_expected = sum(1 for exp in expected_files if any(exp in f for f in retrieved_files))
-            metrics["recall_at_k"] = retrieved_expected / len(expected_files)
+        if expected_set:
+            metrics["recall_at_k"] = len(expected_set.intersection(retrieved_basenames)) / len(expected_set)
         else:
             metrics["recall_at_k"] = 1.0  # No expected files means any retrieval is acceptable
 
@@ -349,12 +600,7 @@ class RAGEvaluator:
 
         # Mean Reciprocal Rank (MRR)
         # Find position of first relevant document
-        mrr = 0.0
-        for i, filename in enumerate(retrieved_files, 1):
-            if any(exp in filename for exp in expected_files):
-                mrr = 1.0 / i
-                break
-        metrics["mrr"] = mrr
+        metrics["mrr"] = next((1.0 / i for i, relevant in enumerate(relevant_mask, 1) if relevant), 0.0)
 
         metrics["retrieved_files"] = retrieved_files
         metrics["expected_files"] = expected_files
@@ -371,22 +617,150 @@ class RAGEvaluator:
         Returns:
             Complete results for this test
         """
-        print(f"\n{'='*70}")
-        print(f"Running Test Case: {test_case['id']} - {test_case['category']}")
-        print(f"Question: {test_case['question']}")
-        print(f"{'='*70}")
+        return asyncio.run(self._run_single_test_async(test_case))
 
-        # Measure query execution time
-        start_time = time.time()
+    def _is_rate_limited(self, error: Exception) -> bool:
+        """Check whether an error looks like throttling or a server failure"""
+        if self._error_type(error) in self.RATE_LIMIT_ERRORS:
+            return True
+        message = repr(error).lower()
+        return any(marker in message for marker in self.RATE_LIMIT_MARKERS)
 
-        try:
-            result = rag_engine.query(
+    @staticmethod
+    def _error_type(error: Exception) -> str:
+        """Class name of the underlying exception (as reported by the engine, if any)"""
+        return getattr(error, "error_type", type(error).__name__)
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Check whether an error is transient (network, timeout, throttling) rather than fatal"""
+        return self._error_type(error) in self.RETRYABLE_ERRORS or self._is_rate_limited(error)
+
+    async def _run_single_test_async(
+        self,
+        test_case: Dict[str, Any],
+        semaphore: asyncio.Semaphore = None
+    ) -> Dict[str, Any]:
+        """
+        Query the RAG engine for one test case and score the answer
+
+        Transient errors are retried up to MAX_ATTEMPTS times with
+        exponential backoff. All output is printed after the query
+        completes, so concurrent tests don't interleave their reports.
+
+        Args:
+            test_case: Test case dictionary
+            semaphore: Optional semaphore bounding tests in flight
+
+        Returns:
+            Complete results for this test
+        """
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(1)
+
+        attempts = 0
+        while True:
+            attempts += 1
+            async with semaphore:
+                await self.bucket.acquire()
+
+                # Measure query execution time
+                start_time = time.time()
+                try:
+                    result = await self._query_engine(test_case)
+                    # The engine reports failures in the result instead of raising
+                    error = EngineQueryError(result) if "error" in result else None
+                except Exception as e:
+                    result, error = None, e
+                query_time = time.time() - start_time
+
+                if error is None:
+                    self.bucket.reward()
+                elif self._is_rate_limited(error):
+                    backoff = self.bucket.penalize()
+                    print(f"⚠️  Rate limited on {test_case['id']}; pausing requests {backoff}s "
+                          f"(rate now {self.bucket.rate:.2f}/s)")
+
+            if error is None or attempts >= self.MAX_ATTEMPTS or not self._is_retryable(error):
+                break
+
+            # Back off outside the semaphore so other tests keep running
+            delay = self.RETRY_BASE_DELAY * 1.5 ** (attempts - 1)
+            print(f"🔁 {test_case['id']}: {self._error_type(error)}; "
+                  f"retrying in {delay:.1f}s (attempt {attempts + 1}/{self.MAX_ATTEMPTS})")
+            await asyncio.sleep(delay)
+
+        return self._score_test(test_case, result, error, query_time, attempts)
+
+    async def _query_engine(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Query the RAG engine, going through the semantic cache when enabled
+
+        Args:
+            test_case: Test case dictionary
+
+        Returns:
+            Engine result dictionary
+        """
+        engine = _get_engine()
+        if self.semantic_cache is None:
+            return await engine.query(
                 question=test_case["question"],
                 user_role=UserRole(test_case["user_role"]),
                 include_sources=True
             )
 
-            query_time = time.time() - start_time
+        vector = await engine.aembed_query(test_case["question"])
+        cached = self.semantic_cache.get(vector, test_case["user_role"])
+        if cached is not None:
+            return cached
+
+        result = await engine.query(
+            question=test_case["question"],
+            user_role=UserRole(test_case["user_role"]),
+            include_sources=True
+        )
+        if "error" not in result:
+            self.semantic_cache.put(vector, test_case["user_role"], result)
+        return result
+
+    def _score_test(
+        self,
+        test_case: Dict[str, Any],
+        result: Dict[str, Any],
+        error: Exception,
+        query_time: float,
+        attempts: int = 1,
+        batch: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Score one test case's answer and print its report
+
+        Args:
+            test_case: Test case dictionary
+            result: Engine result (None if the query raised)
+            error: Query error, if any
+            query_time: Seconds the final attempt took
+            attempts: Number of query attempts made
+            batch: query_time is a batch_query answer's processing time, which
+                includes queueing on the shared retrieval and LLM concurrency
+                limit; it is recorded as batch_query_time and kept out of the
+                latency metrics
+
+        Returns:
+            Complete results for this test
+        """
+        time_field = "batch_query_time" if batch else "query_time"
+
+        # The report is written in one piece so concurrent tests never interleave
+        buf = io.StringIO()
+        print(f"\n{'='*70}", file=buf)
+        print(f"Running Test Case: {test_case['id']} - {test_case['category']}", file=buf)
+        print(f"Question: {test_case['question']}", file=buf)
+        print(f"{'='*70}", file=buf)
+
+        try:
+            if error is not None:
+                raise error
 
             # Evaluate metrics
             quality_metrics = self.evaluate_answer_quality(
@@ -421,44 +795,57 @@ class RAGEvaluator:
                 "difficulty": test_case["difficulty"],
                 "question": test_case["question"],
                 "answer": result["answer"],
-                "query_time": round(query_time, 3),
+                time_field: round(query_time, 3),
+                "attempts": attempts,
                 "passed": passed,
                 **quality_metrics,
                 **retrieval_metrics
             }
 
             # Print summary
-            print(f"✓ Keyword Coverage: {quality_metrics['keyword_coverage']:.2%}")
-            print(f"✓ Query Time: {query_time:.3f}s")
-            print(f"✓ Sources Retrieved: {len(result['sources'])}")
+            print(f"✓ Keyword Coverage: {quality_metrics['keyword_coverage']:.2%}", file=buf)
+            if batch:
+                print(f"✓ Batch Query Time (incl. queueing): {query_time:.3f}s", file=buf)
+            else:
+                print(f"✓ Query Time: {query_time:.3f}s", file=buf)
+            print(f"✓ Sources Retrieved: {len(result['sources'])}", file=buf)
 
             if passed:
-                print(f"✅ TEST PASSED")
+                print(f"✅ TEST PASSED", file=buf)
             else:
-                print(f"❌ TEST FAILED")
+                print(f"❌ TEST FAILED", file=buf)
                 if quality_metrics["keyword_coverage"] < keyword_threshold:
-                    print(f"   - Low keyword coverage: {quality_metrics['keyword_coverage']:.2%}")
-                    print(f"   - Missing: {quality_metrics['missing_keywords']}")
+                    print(f"   - Low keyword coverage: {quality_metrics['keyword_coverage']:.2%}", file=buf)
+                    print(f"   - Missing: {quality_metrics['missing_keywords']}", file=buf)
                 if retrieval_metrics["recall_at_k"] < retrieval_threshold:
-                    print(f"   - Low recall: {retrieval_metrics['recall_at_k']:.2%}")
+                    print(f"   - Low recall: {retrieval_metrics['recall_at_k']:.2%}", file=buf)
 
         except Exception as e:
-            print(f"❌ Error during test execution: {str(e)}")
+            print(f"❌ Error during test execution: {str(e)}", file=buf)
             test_result = {
                 "test_id": test_case["id"],
                 "category": test_case["category"],
                 "difficulty": test_case["difficulty"],
                 "question": test_case["question"],
                 "error": str(e),
+                "error_type": self._error_type(e),
                 "passed": False,
-                "query_time": time.time() - start_time
+                time_field: round(query_time, 3),
+                "attempts": attempts
             }
 
+        _emit(buf)
+        self._record_result(test_result)
         return test_result
 
+    def _record_result(self, test_result: Dict[str, Any]):
+        """Append one test result to the run's JSON Lines file"""
+        if self._jsonl is not None:
+            self._jsonl.write(orjson.dumps(test_result) + b"\n")
+
     def run_all_tests(self) -> Dict[str, Any]:
         """
-        Run all test cases with rate limiting protection
+        Run all test cases concurrently with rate limiting protection
 
         Returns:
             Complete evaluation results
@@ -466,26 +853,121 @@ class RAGEvaluator:
         print(f"\n{'='*70}")
         print(f"STARTING COMPREHENSIVE RAG EVALUATION")
         print(f"{'='*70}")
-        print(f"\n⏱️  Rate Limiting: {self.REQUEST_DELAY}s delay between requests")
+        # The semantic cache sits in front of individual queries, so it implies per-test mode
+        use_batch = self.batch and self.semantic_cache is None and hasattr(_get_engine(), "batch_query")
+        if use_batch:
+            print(f"\n📦 Batch mode: all questions in one rag_engine.batch_query call")
+        else:
+            print(f"\n⏱️  Rate Limiting: {self.max_workers} workers, up to {self.MAX_REQUEST_RATE} requests/s (adaptive)")
         print(f"📊 Total test cases: {len(self.test_cases)}\n")
 
-        for i, test_case in enumerate(self.test_cases, 1):
-            print(f"\nProgress: {i}/{len(self.test_cases)}")
+        self._load_embed_cache()
+        hits_before = _get_engine().query_embedding_cache_hits
 
-            # Run test
-            result = self.run_single_test(test_case)
-            self.results["individual_results"].append(result)
-
-            # RATE LIMITING: Add delay between requests (except after last one)
-            if i < len(self.test_cases):
-                print(f"\n⏳ Waiting {self.REQUEST_DELAY}s before next request...")
-                time.sleep(self.REQUEST_DELAY)
+        # Unbuffered, so finished results survive a crash mid-run
+        self._jsonl = open(self.run_path, 'ab', buffering=0)
+        try:
+            run = self._run_batch_async() if use_batch else self._run_all_async()
+            self.results["individual_results"] = asyncio.run(run)
+        finally:
+            self._jsonl.close()
+            self._jsonl = None
+        print(f"\n📝 Individual results written to: {self.run_path}")
 
         # Calculate aggregate metrics
         self._calculate_aggregate_metrics()
+        self.results["metrics"]["embed_cache_hits"] = _get_engine().query_embedding_cache_hits - hits_before
+        if self.semantic_cache is not None:
+            self.results["metrics"]["semantic_cache_hits"] = self.semantic_cache.hits
+        self._save_embed_cache()
 
         return self.results
 
+    async def _run_batch_async(self) -> List[Dict[str, Any]]:
+        """
+        Answer every test case with one batch_query call, then score locally
+
+        Falls back to per-test queries if the batch call itself fails.
+
+        Returns:
+            Individual results in test-case order
+        """
+        try:
+            answers = await _get_engine().batch_query(
+                [test_case["question"] for test_case in self.test_cases],
+                [UserRole(test_case["user_role"]) for test_case in self.test_cases],
+                include_sources=True
+            )
+        except Exception as e:
+            print(f"⚠️  Batch query failed ({str(e)}); falling back to per-test queries")
+            return await self._run_all_async()
+
+        results = []
+        for test_case, answer in zip(self.test_cases, answers):
+            # The engine reports failures in the result instead of raising
+            error = EngineQueryError(answer) if "error" in answer else None
+            if error is not None and self._is_retryable(error):
+                # Transient failure: retry this case on its own
+                print(f"🔁 {test_case['id']}: {self._error_type(error)} in batch; retrying individually")
+                results.append(await self._run_single_test_async(test_case))
+                continue
+            results.append(self._score_test(test_case, answer, error, answer["processing_time_seconds"], batch=True))
+        return results
+
+    def _embed_cache_key(self) -> Tuple[str, int]:
+        """Embedding settings a persisted cache is only valid for"""
+        return settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSIONS
+
+    def _load_embed_cache(self):
+        """Seed the engine's question embedding cache from the previous run"""
+        try:
+            with open(self.embed_cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable embedding cache: {str(e)}")
+            return
+
+        if cached.get("key") != self._embed_cache_key():
+            print("⚠️  Embedding cache was built with different embedding settings; ignoring it")
+            return
+
+        loaded = _get_engine().load_query_embeddings(cached["vectors"])
+        print(f"✓ Loaded {loaded} cached question embeddings")
+
+    def _save_embed_cache(self):
+        """Persist the engine's question embeddings for the next run"""
+        with open(self.embed_cache_path, 'wb') as f:
+            pickle.dump(
+                {"key": self._embed_cache_key(), "vectors": _get_engine().export_query_embeddings()},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+    async def _run_all_async(self) -> List[Dict[str, Any]]:
+        """
+        Run up to max_workers test cases at once on one event loop
+
+        The engine's batcher and LLM semaphore are bound to the running loop,
+        so tests share a loop rather than each thread starting its own.
+
+        Returns:
+            Individual results in test-case order
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        results: List[Dict[str, Any]] = [None] * len(self.test_cases)
+
+        async def run_indexed(i: int, test_case: Dict[str, Any]):
+            return i, await self._run_single_test_async(test_case, semaphore)
+
+        tasks = [run_indexed(i, test_case) for i, test_case in enumerate(self.test_cases)]
+        for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+            i, result = await next_result
+            results[i] = result
+            print(f"\nProgress: {done}/{len(self.test_cases)}")
+        return results
+
     def _calculate_aggregate_metrics(self):
         """Calculate aggregate metrics from all test results"""
         results = self.results["individual_results"]
@@ -500,133 +982,152 @@ class RAGEvaluator:
             print("\n⚠️  No valid results to calculate metrics")
             return
 
-        # Overall metrics
-        self.results["metrics"]["total_tests"] = len(results)
-        self.results["metrics"]["passed_tests"] = sum(1 for r in valid_results if r.get("passed", False))
-        self.results["metrics"]["pass_rate"] = self.results["metrics"]["passed_tests"] / len(valid_results)
-
-        # Quality metrics
-        self.results["metrics"]["avg_keyword_coverage"] = statistics.mean(
-            r.get("keyword_coverage", 0) for r in valid_results
-        )
-        self.results["metrics"]["avg_answer_length"] = statistics.mean(
-            r.get("answer_length_words", 0) for r in valid_results
+        # Numeric fields as columns (one row per valid test) for vectorized aggregates
+        table = np.fromiter(
+            (
+                tuple(r.get(field, 0) for field in self.AVERAGED_FIELDS)
+                + (bool(r.get("passed", False)), r["category"])
+                for r in valid_results
+            ),
+            dtype=_METRIC_DTYPE,
+            count=len(valid_results)
         )
+        passed_mask = table["passed"]
+        # Latency metrics only cover per-test timings; batch answers carry
+        # batch_query_time instead, which includes queueing
+        timed = np.fromiter((("query_time" in r) for r in valid_results), dtype=bool, count=len(valid_results))
+        query_times = table["query_time"][timed]
 
-        # Retrieval metrics
-        self.results["metrics"]["avg_precision_at_k"] = statistics.mean(
-            r.get("precision_at_k", 0) for r in valid_results
-        )
-        self.results["metrics"]["avg_recall_at_k"] = statistics.mean(
-            r.get("recall_at_k", 0) for r in valid_results
-        )
-        self.results["metrics"]["avg_f1_score"] = statistics.mean(
-            r.get("f1_score", 0) for r in valid_results
-        )
-        self.results["metrics"]["avg_mrr"] = statistics.mean(
-            r.get("mrr", 0) for r in valid_results
-        )
+        metrics = self.results["metrics"]
 
-        # Performance metrics
-        query_times = [r.get("query_time", 0) for r in valid_results]
-        self.results["metrics"]["avg_query_time"] = statistics.mean(query_times)
-        self.results["metrics"]["min_query_time"] = min(query_times)
-        self.results["metrics"]["max_query_time"] = max(query_times)
-
-        # Category breakdown
-        categories = {}
-        for test in valid_results:
-            cat = test["category"]
-            if cat not in categories:
-                categories[cat] = {"total": 0, "passed": 0}
-            categories[cat]["total"] += 1
-            if test.get("passed"):
-                categories[cat]["passed"] += 1
-
-        self.results["metrics"]["category_breakdown"] = {
-            cat: {
-                **stats,
-                "pass_rate": stats["passed"] / stats["total"] if stats["total"] > 0 else 0
+        # Overall metrics
+        metrics["total_tests"] = len(results)
+        metrics["passed_tests"] = int(passed_mask.sum())
+        metrics["pass_rate"] = float(passed_mask.mean())
+
+        # Quality, retrieval and performance averages
+        for field, name in self.AVERAGED_FIELDS.items():
+            column = query_times if field == "query_time" else table[field]
+            if column.size:
+                metrics[name] = float(column.mean())
+        # Tail latency: percentiles instead of the single best/worst sample
+        if query_times.size:
+            for percentile, value in zip(self.QUERY_TIME_PERCENTILES,
+                                         np.percentile(query_times, self.QUERY_TIME_PERCENTILES)):
+                metrics[f"p{percentile}_query_time"] = float(value)
+        batch_times = [r["batch_query_time"] for r in valid_results if "batch_query_time" in r]
+        if batch_times:
+            metrics["avg_batch_query_time"] = float(np.mean(batch_times))
+
+        # Category breakdown (categories in order of first appearance)
+        categories, first_index, inverse, totals = np.unique(
+            table["category"], return_index=True, return_inverse=True, return_counts=True
+        )
+        passed_counts = np.bincount(inverse, weights=passed_mask, minlength=len(categories))
+        metrics["category_breakdown"] = {
+            str(categories[i]): {
+                "total": int(totals[i]),
+                "passed": int(passed_counts[i]),
+                "pass_rate": float(passed_counts[i] / totals[i])
             }
-            for cat, stats in categories.items()
+            for i in np.argsort(first_index)
         }
 
-
     def save_results(self, filename: str = None):
         """
-        Save evaluation results to JSON file
+        Save the evaluation summary (metadata and metrics) to a JSON file
+
+        Individual results are already in the run's JSON Lines file, which the
+        summary references; read them back with load_run.
 
         Args:
             filename: Output filename (default: auto-generated with timestamp)
         """
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"rag_evaluation_results_{timestamp}.json"
+            filename = f"rag_evaluation_results_{self.timestamp}.json"
 
-        output_path = Path("results") / filename
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = self._results_dir / filename
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        summary = {
+            "metadata": self.results["metadata"],
+            "metrics": self.results["metrics"],
+            "individual_results_file": str(self.run_path)
+        }
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
 
         print(f"\n✅ Results saved to: {output_path}")
         return str(output_path)
 
     def print_summary(self):
         """Print evaluation summary to console"""
-        print("\n" + "="*70)
-        print("EVALUATION SUMMARY")
-        print("="*70)
+        buf = io.StringIO()
+        print("\n" + "="*70, file=buf)
+        print("EVALUATION SUMMARY", file=buf)
+        print("="*70, file=buf)
 
         metrics = self.results["metrics"]
 
-        print(f"\n📊 Overall Performance:")
-        print(f"   Total Tests: {metrics.get('total_tests', 0)}")
-        print(f"   Passed: {metrics.get('passed_tests', 0)}")
-        print(f"   Pass Rate: {metrics.get('pass_rate', 0):.2%}")
-
-        print(f"\n📈 Quality Metrics:")
-        print(f"   Avg Keyword Coverage: {metrics.get('avg_keyword_coverage', 0):.2%}")
-        print(f"   Avg Precision@{settings.RETRIEVAL_TOP_K}: {metrics.get('avg_precision_at_k', 0):.2%}")
-        print(f"   Avg Recall@{settings.RETRIEVAL_TOP_K}: {metrics.get('avg_recall_at_k', 0):.2%}")
-        print(f"   Avg F1 Score: {metrics.get('avg_f1_score', 0):.3f}")
-        print(f"   Avg MRR: {metrics.get('avg_mrr', 0):.3f}")
-
-        print(f"\n⚡ Performance Metrics:")
-        print(f"   Avg Query Time: {metrics.get('avg_query_time', 0):.3f}s")
-        print(f"   Min Query Time: {metrics.get('min_query_time', 0):.3f}s")
-        print(f"   Max Query Time: {metrics.get('max_query_time', 0):.3f}s")
-
-        print(f"\n📝 Answer Quality:")
-        print(f"   Avg Answer Length: {metrics.get('avg_answer_length', 0):.0f} words")
-
-        print(f"\n📁 Category Breakdown:")
+        print(f"\n📊 Overall Performance:", file=buf)
+        print(f"   Total Tests: {metrics.get('total_tests', 0)}", file=buf)
+        print(f"   Passed: {metrics.get('passed_tests', 0)}", file=buf)
+        print(f"   Pass Rate: {metrics.get('pass_rate', 0):.2%}", file=buf)
+
+        print(f"\n📈 Quality Metrics:", file=buf)
+        print(f"   Avg Keyword Coverage: {metrics.get('avg_keyword_coverage', 0):.2%}", file=buf)
+        print(f"   Avg Precision@{settings.RETRIEVAL_TOP_K}: {metrics.get('avg_precision_at_k', 0):.2%}", file=buf)
+        print(f"   Avg Recall@{settings.RETRIEVAL_TOP_K}: {metrics.get('avg_recall_at_k', 0):.2%}", file=buf)
+        print(f"   Avg F1 Score: {metrics.get('avg_f1_score', 0):.3f}", file=buf)
+        print(f"   Avg MRR: {metrics.get('avg_mrr', 0):.3f}", file=buf)
+
+        print(f"\n⚡ Performance Metrics:", file=buf)
+        if "avg_query_time" in metrics:
+            print(f"   Avg Query Time: {metrics['avg_query_time']:.3f}s", file=buf)
+            for percentile in self.QUERY_TIME_PERCENTILES:
+                print(f"   P{percentile} Query Time: {metrics[f'p{percentile}_query_time']:.3f}s", file=buf)
+        if "avg_batch_query_time" in metrics:
+            print(f"   Avg Batch Query Time (incl. queueing): {metrics['avg_batch_query_time']:.3f}s", file=buf)
+        print(f"   Embedding Cache Hits: {metrics.get('embed_cache_hits', 0)}", file=buf)
+        if "semantic_cache_hits" in metrics:
+            print(f"   Semantic Cache Hits: {metrics['semantic_cache_hits']}", file=buf)
+
+        print(f"\n📝 Answer Quality:", file=buf)
+        print(f"   Avg Answer Length: {metrics.get('avg_answer_length', 0):.0f} words", file=buf)
+
+        print(f"\n📁 Category Breakdown:", file=buf)
         for cat, stats in metrics.get("category_breakdown", {}).items():
-            print(f"   {cat:20s}: {stats['passed']:2d}/{stats['total']:2d} ({stats['pass_rate']:.2%})")
+            print(f"   {cat:20s}: {stats['passed']:2d}/{stats['total']:2d} ({stats['pass_rate']:.2%})", file=buf)
 
-        print("\n" + "="*70)
+        print("\n" + "="*70, file=buf)
 
         # Detailed failure analysis
         failed_tests = [r for r in self.results["individual_results"] 
                        if not r.get("passed", False)]
 
         if failed_tests:
-            print(f"\n❌ FAILED TESTS ANALYSIS ({len(failed_tests)} tests):")
-            print("="*70)
+            print(f"\n❌ FAILED TESTS ANALYSIS ({len(failed_tests)} tests):", file=buf)
+            print("="*70, file=buf)
             for test in failed_tests:
-                print(f"\n  {test['test_id']}: {test['question'][:60]}...")
+                print(f"\n  {test['test_id']}: {test['question'][:60]}...", file=buf)
                 if "error" in test:
-                    print(f"    Error: {test['error']}")
+                    print(f"    Error: {test['error']}", file=buf)
                 else:
-                    print(f"    Keyword Coverage: {test.get('keyword_coverage', 0):.2%}")
-                    print(f"    Recall@K: {test.get('recall_at_k', 0):.2%}")
-                    print(f"    Sources Retrieved: {test.get('sources_count', 0)}")
+                    print(f"    Keyword Coverage: {test.get('keyword_coverage', 0):.2%}", file=buf)
+                    print(f"    Recall@K: {test.get('recall_at_k', 0):.2%}", file=buf)
+                    print(f"    Sources Retrieved: {test.get('sources_count', 0)}", file=buf)
                     if test.get('missing_keywords'):
-                        print(f"    Missing Keywords: {test['missing_keywords']}")
+                        print(f"    Missing Keywords: {test['missing_keywords']}", file=buf)
+
+        _emit(buf)
 
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Evaluate the RAG engine directly")
+    parser.add_argument("--use-semantic-cache", action="store_true",
+                        help="Reuse answers of near-identical questions (Phase 2 comparisons only)")
+    args = parser.parse_args()
+
     print("""
 ╔═══════════════════════════════════════════════════════════════════╗
 ║                                                                   ║
@@ -648,8 +1149,12 @@ def main():
     print(f"   EMBEDDING_MODEL: {settings.EMBEDDING_MODEL}")
     print(f"   CHAT_MODEL: {settings.CHAT_MODEL}")
 
+    # Load the document processor and RAG engine before any test is timed
+    _get_docproc()
+    _get_engine()
+
     # Run evaluation
-    evaluator = RAGEvaluator()
+    evaluator = RAGEvaluator(use_semantic_cache=args.use_semantic_cache)
     results = evaluator.run_all_tests()
 
     # Print summary
@@ -660,7 +1165,7 @@ def main():
 
     print(f"\n✅ Evaluation complete! Results saved to: {output_file}")
     print(f"\n💡 Next Steps:")
-    print(f"   1. Review the results JSON file for detailed metrics")
+    print(f"   1. Review the results JSON file for metrics and the run .jsonl for per-test details")
     print(f"   2. Identify areas for improvement")
     print(f"   3. Adjust configuration in config.py (Phase 2)")
     print(f"   4. Re-run evaluation to compare results")
@@ -4,12 +4,12 @@ Quick test to verify RAG retrieval is working
 """
 
 import sys
+import asyncio
 sys.path.append('..')
 
-# from backend.rag_engine import rag_engine
 from backend.models import UserRole
-from backend.rag_engine import RAGEngine
-rag_engine = RAGEngine()
+from backend.rag_engine import get_rag_engine
+rag_engine = get_rag_engine()
 
 
 print("="*70)
@@ -17,11 +17,11 @@ print("TESTING RAG ENGINE RETRIEVAL")
 print("="*70)
 
 # Test query
-result = rag_engine.query(
+result = asyncio.run(rag_engine.query(
     question='What are the visiting hours for ICU?',
     user_role=UserRole.GENERAL,
     include_sources=True
-)
+))
 
 # Check results
 sources_count = len(result["sources"])
@@ -40,7 +40,7 @@ if sources_count > 0:
     print(f"   python rag_evaluation.py")
 else:
     print('\n❌ PROBLEM: Still returning 0 sources')
-    print('   Check that the fix was applied correctly to rag_engine.py')
-    print('   The query() method should refresh vectorstore at the start.')
+    print('   Check that documents have been ingested into the vector database')
+    print('   After re-ingesting in a running process, call rag_engine.reload_index()')
 
 print("\n" + "="*70)
\ No newline at end of file